@@ -11,50 +11,118 @@ bot_commands.py - 텔레그램 봇 커맨드 핸들러
   /도움        — 명령어 도움말
 """
 
-import json
+import os
+import random
+import re
+import socket
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
+import json_codec
 from config import (
     TELEGRAM_BOT_TOKEN, CHAT_IDS, WEATHER_SCHEDULE_TIME, NEWS_SCHEDULE_TIMES,
-    NEWS_KEYWORDS, NEWS_COUNT_PER_KEYWORD,
+    NEWS_KEYWORDS, NEWS_COUNT_PER_KEYWORD, BOT_WORKERS,
     CITY_MAP, CITY_MAP_REV,
 )
-from telegram_sender import send_message
+from news_bot import send_news
+from telegram_sender import send_message, edit_message
+from weather_alert import load_location as wa_load, get_weather_message, write_location
 
 LOCATION_FILE = Path(__file__).parent / "weather_location.json"
+GEOCODE_CACHE_FILE = Path(__file__).parent / "geocode_cache.json"
+
+# 역지오코딩 좌표 양자화 자릿수 (소수 3자리 ≈ 100m 격자)
+_GEOCODE_PRECISION = 3
+# 역지오코딩 캐시 최대 보관 수 (초과 시 가장 오래 사용되지 않은 것부터 제거)
+_GEOCODE_CACHE_LIMIT = 4096
+# Nominatim 사용 정책: 초당 최대 1회 요청
+_NOMINATIM_MIN_INTERVAL = 1.0
+# 광역 행정구역 접미사 ("서울특별시" → "서울"), 긴 접미사 우선
+_CITY_SUFFIX_RE = re.compile("특별자치시|특별자치도|특별시|광역시")
+
+# getUpdates 폴링 설정
+_LONG_POLL_TIMEOUT = 50      # 텔레그램 최대 long poll 대기시간 (초)
+_UPDATES_LIMIT = 100         # 1회 최대 수신 건수 (텔레그램 기본/최대값)
+_MAX_DRAIN_CYCLES = 3        # 적체 시 연속 짧은 폴링 횟수
+_CONFLICT_BACKOFF_MAX = 60   # 409 충돌 백오프 상한 (초)
+_ERROR_BACKOFF_MAX = 60      # 네트워크/API 오류 백오프 상한 (초)
+
+# TCP keepalive: 50초 long poll 동안 NAT 매핑이 만료되지 않도록 20초마다 probe,
+# 응답 없는 연결은 probe 3회(10초 간격) 실패 시 끊김으로 감지
+# (TCP_KEEP* 상수는 플랫폼별 지원 여부가 달라 있는 것만 적용)
+_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 20), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+]
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """TCP keepalive 소켓 옵션을 적용한 HTTPAdapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + _KEEPALIVE_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+# 리스너/핸들러 공용 HTTP 세션 (keep-alive로 TLS 핸드셰이크 재사용)
+_SESSION = requests.Session()
+_SESSION.mount("https://", _KeepAliveAdapter(pool_connections=4, pool_maxsize=BOT_WORKERS))
+
+# 명령 핸들러 공용 스레드 풀 (명령마다 스레드를 새로 만들지 않음)
+_EXECUTOR = ThreadPoolExecutor(max_workers=BOT_WORKERS, thread_name_prefix="cmd")
+
+# 채팅별 작업 큐 (키가 있으면 해당 채팅의 드레인 워커가 실행 중)
+_chat_queues: dict[str, deque] = {}
+_chat_queues_lock = threading.Lock()
 
 
 # ──────────────────────────────────────────────
 # 위치 설정 저장/로드
 # ──────────────────────────────────────────────
 
+_DEFAULT_LOCATION = {"mode": "manual", "city": "Seoul", "city_kr": "서울"}
+
+# 위치 설정 캐시 (파일 mtime이 같으면 재파싱 생략)
+_location_cache = {"mtime_ns": None, "data": None}
+
+
 def load_location() -> dict:
-    """저장된 위치 설정을 로드합니다."""
-    if LOCATION_FILE.exists():
+    """저장된 위치 설정을 로드합니다. (파일 변경 시에만 다시 읽음)"""
+    try:
+        mtime_ns = LOCATION_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return dict(_DEFAULT_LOCATION)
+
+    if mtime_ns != _location_cache["mtime_ns"]:
         try:
-            return json.loads(LOCATION_FILE.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, KeyError):
-            pass
-    return {"mode": "manual", "city": "Seoul", "city_kr": "서울"}
+            data = json_codec.loads(LOCATION_FILE.read_bytes())
+        except (json_codec.JSONDecodeError, KeyError):
+            return dict(_DEFAULT_LOCATION)
+        _location_cache.update(mtime_ns=mtime_ns, data=data)
+    return dict(_location_cache["data"])
 
 
 def save_location(data: dict):
     """위치 설정을 저장합니다."""
     data["updated"] = datetime.now().isoformat()
-    LOCATION_FILE.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    write_location(data)
+    # 방금 쓴 내용으로 캐시 갱신 (다음 로드는 stat 1회로 끝남)
+    _location_cache.update(mtime_ns=LOCATION_FILE.stat().st_mtime_ns, data=dict(data))
 
 
 def detect_location_by_ip() -> dict | None:
     """IP 기반으로 현재 위치를 감지합니다."""
     try:
-        resp = requests.get("https://ipinfo.io/json", timeout=10)
+        resp = _SESSION.get("https://ipinfo.io/json", timeout=10)
         resp.raise_for_status()
         info = resp.json()
         return {
@@ -67,61 +135,123 @@ def detect_location_by_ip() -> dict | None:
         return None
 
 
+def _load_geocode_cache() -> dict:
+    """디스크에 저장된 역지오코딩 캐시를 로드합니다."""
+    if GEOCODE_CACHE_FILE.exists():
+        try:
+            return json_codec.loads(GEOCODE_CACHE_FILE.read_bytes())
+        except (json_codec.JSONDecodeError, OSError):
+            pass
+    return {}
+
+
+_geocode_cache = _load_geocode_cache()
+_geocode_cache_lock = threading.Lock()  # 캐시 순서 갱신/저장용
+_geocode_lock = threading.Lock()  # Nominatim 요청 간격 제한용
+_nominatim_last_call = 0.0
+
+
+def _quantize(lat: float, lon: float) -> tuple[float, float]:
+    """캐시 키용 좌표 양자화 (약 100m 격자)"""
+    return round(lat, _GEOCODE_PRECISION), round(lon, _GEOCODE_PRECISION)
+
+
+def _is_geocode_cached(lat: float, lon: float) -> bool:
+    """해당 좌표의 역지오코딩 결과가 캐시에 있는지 확인 (네트워크 호출 없음)"""
+    qlat, qlon = _quantize(lat, lon)
+    return f"{qlat},{qlon}" in _geocode_cache
+
+
 def _reverse_geocode(lat: float, lon: float) -> dict | None:
     """
     좌표 → 주소 상세 변환 (Nominatim 무료 API).
+    좌표를 약 100m 격자로 양자화하여 메모리(LRU) + 디스크 캐시를 사용합니다.
     Returns: {"city": "서울특별시", "district": "마포구", "display": "서울 마포구"}
     """
+    qlat, qlon = _quantize(lat, lon)
+    cache_key = f"{qlat},{qlon}"
+    with _geocode_cache_lock:
+        cached = _geocode_cache.pop(cache_key, None)
+        if cached:
+            _geocode_cache[cache_key] = cached  # 최근 사용 항목을 맨 뒤로
+            return cached
+
     try:
-        resp = requests.get(
-            "https://nominatim.openstreetmap.org/reverse",
-            params={
-                "lat": lat, "lon": lon,
-                "format": "json",
-                "zoom": 14,  # 구/동 단위
-                "accept-language": "ko",
-            },
-            headers={"User-Agent": "TelegramWeatherBot/1.0"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        addr = resp.json().get("address", {})
-
-        city = (
-            addr.get("city")
-            or addr.get("town")
-            or addr.get("county")
-            or addr.get("state")
-            or ""
-        )
-        # 구 단위
-        district = (
-            addr.get("city_district")
-            or addr.get("suburb")
-            or addr.get("borough")
-            or addr.get("quarter")
-            or ""
-        )
-        # 동 단위
-        dong = (
-            addr.get("neighbourhood")
-            or addr.get("village")
-            or addr.get("town")
-            or ""
-        )
-        # 동 이름이 시/구와 겹치면 제외
-        if dong and (dong == city or dong == district):
-            dong = ""
+        result = _fetch_reverse_geocode(qlat, qlon)
+    except Exception:
+        # 실패 결과는 캐시하지 않음
+        return None
 
-        # "서울특별시" → "서울"
-        city_short = city.replace("특별시", "").replace("광역시", "").replace("특별자치시", "").replace("특별자치도", "")
+    with _geocode_cache_lock:
+        _geocode_cache[cache_key] = result
+        # 맨 앞(가장 오래 사용되지 않은 항목)부터 제거 (dict는 삽입 순서 유지)
+        while len(_geocode_cache) > _GEOCODE_CACHE_LIMIT:
+            del _geocode_cache[next(iter(_geocode_cache))]
+        # 임시 파일에 쓴 뒤 교체 → 쓰기 도중 종료돼도 캐시 파일 손상 없음
+        tmp = GEOCODE_CACHE_FILE.with_suffix(".tmp")
+        tmp.write_bytes(json_codec.dumps(_geocode_cache))
+        os.replace(tmp, GEOCODE_CACHE_FILE)
+    return result
+
+
+def _fetch_reverse_geocode(lat: float, lon: float) -> dict:
+    """Nominatim 역지오코딩 요청 (초당 1회 제한 준수)"""
+    global _nominatim_last_call
+
+    with _geocode_lock:
+        wait = _nominatim_last_call + _NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _nominatim_last_call = time.monotonic()
+
+    resp = _SESSION.get(
+        "https://nominatim.openstreetmap.org/reverse",
+        params={
+            "lat": lat, "lon": lon,
+            "format": "json",
+            "zoom": 14,  # 구/동 단위
+            "accept-language": "ko",
+        },
+        headers={"User-Agent": "TelegramWeatherBot/1.0"},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    # 응답 바이트를 바로 파싱 (중간 str 디코딩 생략)
+    addr = json_codec.loads(resp.content).get("address", {})
+
+    city = (
+        addr.get("city")
+        or addr.get("town")
+        or addr.get("county")
+        or addr.get("state")
+        or ""
+    )
+    # 구 단위
+    district = (
+        addr.get("city_district")
+        or addr.get("suburb")
+        or addr.get("borough")
+        or addr.get("quarter")
+        or ""
+    )
+    # 동 단위
+    dong = (
+        addr.get("neighbourhood")
+        or addr.get("village")
+        or addr.get("town")
+        or ""
+    )
+    # 동 이름이 시/구와 겹치면 제외
+    if dong and (dong == city or dong == district):
+        dong = ""
 
-        parts = [p for p in [city_short, district, dong] if p]
-        display = " ".join(parts)
+    # "서울특별시" → "서울"
+    city_short = _CITY_SUFFIX_RE.sub("", city)
 
-        return {"city": city, "district": district, "dong": dong, "display": display}
-    except Exception:
-        return None
+    parts = [p for p in [city_short, district, dong] if p]
+    display = " ".join(parts)
+
+    return {"city": city, "district": district, "dong": dong, "display": display}
 
 
 # ──────────────────────────────────────────────
@@ -132,7 +262,7 @@ def _clear_webhook(token: str):
     """기존 웹훅/폴링 세션을 정리하여 getUpdates 충돌을 방지합니다."""
     url = f"https://api.telegram.org/bot{token}/deleteWebhook"
     try:
-        resp = requests.post(url, json={"drop_pending_updates": False}, timeout=10)
+        resp = _SESSION.post(url, json={"drop_pending_updates": False}, timeout=10)
         data = resp.json()
         if data.get("ok"):
             print("[커맨드] 웹훅/이전 폴링 세션 정리 완료", flush=True)
@@ -142,34 +272,72 @@ def _clear_webhook(token: str):
         print(f"[커맨드] 웹훅 정리 예외: {e}", flush=True)
 
 
-def _get_updates(token: str, offset: int = 0, timeout: int = 30) -> list | None:
+def _get_updates(token: str, offset: int = 0, timeout: int = _LONG_POLL_TIMEOUT,
+                 limit: int = _UPDATES_LIMIT) -> list | None:
     """텔레그램 업데이트(메시지+채널포스트)를 가져옵니다. (Long Polling)
 
     Returns:
         list: 업데이트 목록
         None: 409 Conflict 발생 시 (재초기화 필요 신호)
+    Raises:
+        네트워크 오류 또는 API 오류 응답 (리스너에서 백오프 처리)
     """
     url = f"https://api.telegram.org/bot{token}/getUpdates"
     params = {
         "offset": offset,
         "timeout": timeout,
+        "limit": limit,
         "allowed_updates": ["message", "channel_post"],
     }
-    try:
-        resp = requests.get(url, params=params, timeout=timeout + 10)
-        data = resp.json()
-        if data.get("ok"):
-            return data.get("result", [])
+    # (연결 타임아웃, 읽기 타임아웃) — 읽기는 long poll 대기시간 + 여유 10초
+    resp = _SESSION.get(url, params=params, timeout=(10, timeout + 10))
+    data = json_codec.loads(resp.content)
+    if data.get("ok"):
+        return data.get("result", [])
+
+    # 409 Conflict: 다른 인스턴스가 동시에 getUpdates 호출 중
+    if resp.status_code == 409:
+        print("[커맨드] 409 Conflict 감지 — 다른 인스턴스와 충돌", flush=True)
+        return None
 
-        # 409 Conflict: 다른 인스턴스가 동시에 getUpdates 호출 중
-        if resp.status_code == 409:
-            print("[커맨드] 409 Conflict 감지 — 다른 인스턴스와 충돌", flush=True)
-            return None
+    raise RuntimeError(f"getUpdates 오류: {data.get('description', '')}")
 
-        print(f"[커맨드] getUpdates 오류: {data.get('description', '')}", flush=True)
-    except Exception as e:
-        print(f"[커맨드] getUpdates 예외: {e}", flush=True)
-    return []
+
+# ──────────────────────────────────────────────
+# 고정 응답 메시지 (설정값 기반, 모듈 로드 시 1회 생성)
+# ──────────────────────────────────────────────
+
+_NEWS_TIMES_STR = ", ".join(NEWS_SCHEDULE_TIMES)
+_MODE_LABELS = {"manual": "수동 설정", "auto": "자동 (IP)", "gps": "GPS 위치"}
+
+_LOCATION_USAGE_REPLY = (
+    "📍 <b>위치 설정 방법</b>\n\n"
+    "1️⃣ <b>수동 설정</b>\n"
+    "   /위치 부산\n"
+    "   /위치 Seoul\n\n"
+    "2️⃣ <b>자동 감지</b>\n"
+    "   /위치 자동\n\n"
+    f"🏙️ 주요 도시: {'  '.join(list(CITY_MAP)[:10])} ..."
+)
+
+_HELP_REPLY = (
+    "🤖 <b>텔레그램 봇 명령어</b>\n\n"
+    "🌤️ <b>날씨</b>\n"
+    f"  /날씨 — 현재 날씨 즉시 확인 (매일 {WEATHER_SCHEDULE_TIME} 자동)\n\n"
+    "📰 <b>뉴스</b>\n"
+    f"  /뉴스 — 뉴스 브리핑 즉시 발송 (매일 {_NEWS_TIMES_STR} 자동)\n"
+    f"  • 키워드 {len(NEWS_KEYWORDS)}개, 키워드당 {NEWS_COUNT_PER_KEYWORD}건\n"
+    f"  • 추적 키워드: {', '.join(NEWS_KEYWORDS)}\n"
+    "  • 중복 기사 자동 필터링\n\n"
+    "📍 <b>위치 설정</b>\n"
+    "  /위치 서울 — 도시 직접 설정 (한글/영문)\n"
+    "  /위치 자동 — IP 기반 자동 감지\n"
+    "  • 예시: /위치 부산, /위치 대전, /위치 제주\n"
+    f"  • 지원 도시: {', '.join(CITY_MAP)}\n\n"
+    "⚙️ <b>설정</b>\n"
+    "  /설정 — 현재 설정 확인\n"
+    "  /도움 — 이 도움말"
+)
 
 
 # ──────────────────────────────────────────────
@@ -177,13 +345,13 @@ def _get_updates(token: str, offset: int = 0, timeout: int = 30) -> list | None:
 # ──────────────────────────────────────────────
 
 def handle_message(token: str, message: dict):
-    """수신된 메시지를 분석하고 별도 스레드에서 처리합니다."""
+    """수신된 메시지를 분석하고 채팅별 작업 큐에 넣어 처리합니다."""
     chat_id = str(message["chat"]["id"])
 
     # 텔레그램 위치 공유 메시지 처리 (📎 → 위치)
     location = message.get("location")
     if location:
-        _run_in_thread(_handle_gps_location, token, chat_id, location)
+        _enqueue_for_chat(chat_id, _handle_gps_location, token, chat_id, location)
         return
 
     text = message.get("text", "").strip()
@@ -192,27 +360,58 @@ def handle_message(token: str, message: dict):
 
     print(f"[커맨드] 수신: {text} (chat_id: {chat_id})", flush=True)
 
-    # 공백 제거한 정규화 명령 (띄어쓰기/붙여쓰기 모두 인식)
-    cmd = text.replace(" ", "")
-
-    if cmd.startswith("/위치자동"):
-        _run_in_thread(_cmd_auto_location, token, chat_id)
-    elif cmd.startswith("/위치"):
-        _run_in_thread(_cmd_set_location, token, chat_id, text)
-    elif cmd.startswith("/날씨"):
-        _run_in_thread(_cmd_weather_now, token, chat_id)
-    elif cmd.startswith("/뉴스"):
-        _run_in_thread(_cmd_news_now, token, chat_id)
-    elif cmd.startswith("/설정"):
-        _run_in_thread(_cmd_show_settings, token, chat_id)
-    elif cmd.startswith("/도움") or cmd.startswith("/help"):
-        _run_in_thread(_cmd_help, token, chat_id)
+    # 첫 토큰으로 O(1) 조회 ("/help@봇이름" 형식의 멘션 제거)
+    head = text.split(maxsplit=1)[0].split("@", 1)[0]
+    handler = _CMD_TABLE.get(head)
+    if handler is None:
+        # 붙여쓴 인자 ("/위치부산") → 공백 제거한 정규화 명령으로 접두사 매칭
+        cmd = text.replace(" ", "")
+        handler = next((h for prefix, h in _CMD_PREFIXES if cmd.startswith(prefix)), None)
+        if handler is None:
+            return
+
+    if handler is _cmd_set_location:
+        _enqueue_for_chat(chat_id, handler, token, chat_id, text)
+    else:
+        _enqueue_for_chat(chat_id, handler, token, chat_id)
 
 
-def _run_in_thread(func, *args):
-    """명령 핸들러를 별도 스레드에서 실행 (리스너 블로킹 방지)"""
-    t = threading.Thread(target=_safe_run, args=(func, *args), daemon=True)
-    t.start()
+def _enqueue_for_chat(chat_id: str, func, *args):
+    """
+    명령 핸들러를 채팅별 FIFO 큐에 넣고 스레드 풀에서 실행합니다.
+    같은 채팅의 명령은 순서대로, 다른 채팅의 명령은 병렬로 처리됩니다.
+    (느린 /뉴스가 다른 채팅의 명령을 막지 않음)
+    """
+    with _chat_queues_lock:
+        queue = _chat_queues.get(chat_id)
+        if queue is not None:
+            queue.append((func, args))
+            return
+        _chat_queues[chat_id] = deque([(func, args)])
+    _EXECUTOR.submit(_drain_chat_queue, chat_id)
+
+
+def _drain_chat_queue(chat_id: str):
+    """채팅 큐가 빌 때까지 순서대로 실행 후 종료 (유휴 채팅은 워커를 점유하지 않음)"""
+    while True:
+        with _chat_queues_lock:
+            queue = _chat_queues[chat_id]
+            if not queue:
+                del _chat_queues[chat_id]
+                return
+            func, args = queue.popleft()
+        _safe_run(func, *args)
+
+
+def stop_command_workers():
+    """
+    종료 시 대기 중인 명령을 버리고 스레드 풀을 닫습니다.
+    실행 중인 명령은 취소할 수 없어 해당 요청의 timeout 안에서 끝날 때까지 종료가 늦어질 수 있습니다.
+    """
+    with _chat_queues_lock:
+        for queue in _chat_queues.values():
+            queue.clear()
+    _EXECUTOR.shutdown(wait=False, cancel_futures=True)
 
 
 def _safe_run(func, *args):
@@ -228,6 +427,13 @@ def _handle_gps_location(token: str, chat_id: str, location: dict):
     lat = location["latitude"]
     lon = location["longitude"]
 
+    # 캐시에 없으면 Nominatim 조회(수백 ms~) 전에 접수 메시지부터 보내고, 결과는 수정으로 반영
+    ack_message_id = None
+    if not _is_geocode_cached(lat, lon):
+        ack = send_message(token, chat_id, "📍 위치 확인 중…")
+        if ack.get("ok"):
+            ack_message_id = ack["result"]["message_id"]
+
     # 좌표 → 구/동 단위 변환
     geo = _reverse_geocode(lat, lon)
     display_name = geo["display"] if geo and geo.get("display") else f"{lat:.2f},{lon:.2f}"
@@ -246,7 +452,14 @@ def _handle_gps_location(token: str, chat_id: str, location: dict):
         f"좌표: {lat:.4f}, {lon:.4f}\n"
         f"모드: GPS"
     )
-    send_message(token, chat_id, reply)
+    edited = False
+    if ack_message_id is not None:
+        try:
+            edited = edit_message(token, chat_id, ack_message_id, reply).get("ok", False)
+        except requests.RequestException as e:
+            print(f"[커맨드] 위치 안내 메시지 수정 실패: {e}", flush=True)
+    if not edited:
+        send_message(token, chat_id, reply)
 
 
 def _cmd_auto_location(token: str, chat_id: str):
@@ -257,12 +470,14 @@ def _cmd_auto_location(token: str, chat_id: str):
         return
 
     city = loc["city"]
-    city_kr = CITY_MAP_REV.get(city.lower(), city)
+    city_kr = CITY_MAP_REV.get(city.casefold(), city)
 
     save_location({
         "mode": "auto",
         "city": city,
         "city_kr": city_kr,
+        # 날씨 발송 시 IP 재조회 생략용 (weather_alert.AUTO_DETECT_TTL_SEC 동안 유효)
+        "auto_detected": {"city": city, "ts": time.time()},
     })
 
     reply = (
@@ -289,17 +504,7 @@ def _cmd_set_location(token: str, chat_id: str, text: str):
         return
 
     if not arg:
-        cities = "  ".join(list(CITY_MAP.keys())[:10])
-        reply = (
-            "📍 <b>위치 설정 방법</b>\n\n"
-            "1️⃣ <b>수동 설정</b>\n"
-            "   /위치 부산\n"
-            "   /위치 Seoul\n\n"
-            "2️⃣ <b>자동 감지</b>\n"
-            "   /위치 자동\n\n"
-            f"🏙️ 주요 도시: {cities} ..."
-        )
-        send_message(token, chat_id, reply)
+        send_message(token, chat_id, _LOCATION_USAGE_REPLY)
         return
 
     city_input = arg
@@ -310,7 +515,7 @@ def _cmd_set_location(token: str, chat_id: str, text: str):
         city_kr = city_input
     else:
         city_en = city_input
-        city_kr = CITY_MAP_REV.get(city_input.lower(), city_input)
+        city_kr = CITY_MAP_REV.get(city_input.casefold(), city_input)
 
     save_location({"mode": "manual", "city": city_en, "city_kr": city_kr})
 
@@ -324,8 +529,6 @@ def _cmd_set_location(token: str, chat_id: str, text: str):
 
 def _cmd_weather_now(token: str, chat_id: str):
     """즉시 날씨 확인: /날씨"""
-    from weather_alert import load_location as wa_load, get_weather_message
-
     city, city_kr = wa_load()
     print(f"[커맨드] /날씨 처리: {city_kr}({city})", flush=True)
     try:
@@ -339,8 +542,6 @@ def _cmd_weather_now(token: str, chat_id: str):
 
 def _cmd_news_now(token: str, chat_id: str):
     """즉시 뉴스 발송: /뉴스"""
-    from news_bot import send_news
-
     print(f"[커맨드] /뉴스 처리 시작", flush=True)
     send_message(token, chat_id, "📰 뉴스 수집 중... 잠시만 기다려주세요.")
     try:
@@ -361,17 +562,14 @@ def _cmd_news_now(token: str, chat_id: str):
 def _cmd_show_settings(token: str, chat_id: str):
     """현재 설정 확인: /설정"""
     loc = load_location()
-    mode_map = {"manual": "수동 설정", "auto": "자동 (IP)", "gps": "GPS 위치"}
-    mode_str = mode_map.get(loc.get("mode", "manual"), "수동 설정")
-
-    news_times = ", ".join(NEWS_SCHEDULE_TIMES)
+    mode_str = _MODE_LABELS.get(loc.get("mode", "manual"), "수동 설정")
 
     reply = (
         f"⚙️ <b>현재 설정</b>\n\n"
         f"📍 위치: {loc.get('city_kr', '서울')} ({loc.get('city', 'Seoul')})\n"
         f"🔧 모드: {mode_str}\n"
         f"🌤️ 날씨: 매일 {WEATHER_SCHEDULE_TIME}\n"
-        f"📰 뉴스: 매일 {news_times}\n\n"
+        f"📰 뉴스: 매일 {_NEWS_TIMES_STR}\n\n"
         f"💡 /도움 — 전체 명령 목록"
     )
     send_message(token, chat_id, reply)
@@ -379,30 +577,21 @@ def _cmd_show_settings(token: str, chat_id: str):
 
 def _cmd_help(token: str, chat_id: str):
     """도움말: /도움"""
-    news_times = ", ".join(NEWS_SCHEDULE_TIMES)
+    send_message(token, chat_id, _HELP_REPLY)
 
-    kw_count = len(NEWS_KEYWORDS)
-    kw_list = ", ".join(NEWS_KEYWORDS)
 
-    reply = (
-        "🤖 <b>텔레그램 봇 명령어</b>\n\n"
-        "🌤️ <b>날씨</b>\n"
-        f"  /날씨 — 현재 날씨 즉시 확인 (매일 {WEATHER_SCHEDULE_TIME} 자동)\n\n"
-        "📰 <b>뉴스</b>\n"
-        f"  /뉴스 — 뉴스 브리핑 즉시 발송 (매일 {news_times} 자동)\n"
-        f"  • 키워드 {kw_count}개, 키워드당 {NEWS_COUNT_PER_KEYWORD}건\n"
-        f"  • 추적 키워드: {kw_list}\n"
-        "  • 중복 기사 자동 필터링\n\n"
-        "📍 <b>위치 설정</b>\n"
-        "  /위치 서울 — 도시 직접 설정 (한글/영문)\n"
-        "  /위치 자동 — IP 기반 자동 감지\n"
-        "  • 예시: /위치 부산, /위치 대전, /위치 제주\n"
-        f"  • 지원 도시: {', '.join(list(CITY_MAP.keys()))}\n\n"
-        "⚙️ <b>설정</b>\n"
-        "  /설정 — 현재 설정 확인\n"
-        "  /도움 — 이 도움말"
-    )
-    send_message(token, chat_id, reply)
+# 명령 → 핸들러 디스패치 테이블
+_CMD_TABLE = {
+    "/위치자동": _cmd_auto_location,
+    "/위치": _cmd_set_location,
+    "/날씨": _cmd_weather_now,
+    "/뉴스": _cmd_news_now,
+    "/설정": _cmd_show_settings,
+    "/도움": _cmd_help,
+    "/help": _cmd_help,
+}
+# 접두사 매칭용 (긴 명령 우선: "/위치자동" → "/위치")
+_CMD_PREFIXES = tuple(sorted(_CMD_TABLE.items(), key=lambda kv: -len(kv[0])))
 
 
 # ──────────────────────────────────────────────
@@ -434,21 +623,25 @@ def start_command_listener(token: str | None = None):
         )
         offset = 0
         conflict_count = 0
+        err_streak = 0
+        poll_timeout = _LONG_POLL_TIMEOUT
+        drain_cycles = 0
 
         while True:
             try:
-                updates = _get_updates(token, offset=offset, timeout=30)
+                updates = _get_updates(token, offset=offset, timeout=poll_timeout)
 
-                # 409 Conflict → 백오프 후 재초기화
+                # 409 Conflict → 지수 백오프 후 재초기화 (5, 10, 20, 40, 60초...)
                 if updates is None:
                     conflict_count += 1
-                    backoff = min(conflict_count * 5, 30)
+                    backoff = min(5 * 2 ** (conflict_count - 1), _CONFLICT_BACKOFF_MAX)
                     print(f"[커맨드] 충돌 복구 대기 {backoff}초 (#{conflict_count})", flush=True)
                     time.sleep(backoff)
                     _clear_webhook(token)
                     continue
 
                 conflict_count = 0  # 정상 응답 시 카운터 초기화
+                err_streak = 0
 
                 for update in updates:
                     offset = update["update_id"] + 1
@@ -460,9 +653,20 @@ def start_command_listener(token: str | None = None):
                         message = update.get("channel_post")
                     if message:
                         handle_message(token, message)
+
+                # 배치가 가득 찼으면 적체 상태 → 대기 없이 연속 폴링으로 비움
+                if len(updates) >= _UPDATES_LIMIT and drain_cycles < _MAX_DRAIN_CYCLES:
+                    drain_cycles += 1
+                    poll_timeout = 0
+                else:
+                    drain_cycles = 0
+                    poll_timeout = _LONG_POLL_TIMEOUT
             except Exception as e:
-                print(f"[커맨드] 리스너 오류: {e}", flush=True)
-                time.sleep(5)
+                # 연속 오류 시 지수 백오프 + 지터 (1, 2, 4, ... 최대 60초)
+                backoff = min(2 ** err_streak, _ERROR_BACKOFF_MAX) + random.uniform(0, 1)
+                err_streak += 1
+                print(f"[커맨드] 리스너 오류: {e} — {backoff:.1f}초 후 재시도 (#{err_streak})", flush=True)
+                time.sleep(backoff)
 
     thread = threading.Thread(target=listener, daemon=True, name="CommandListener")
     thread.start()
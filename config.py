@@ -4,6 +4,8 @@ config.py - 중앙 설정
 """
 
 import os
+from types import MappingProxyType
+
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -20,6 +22,10 @@ CHAT_IDS = {
     "뉴스 채널": os.getenv("NEWS_CHANNEL_ID", "-1003854343800"),
 }
 
+# === 봇 명령 처리 설정 ===
+# 명령 핸들러 동시 실행 워커 수
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", "8"))
+
 # === 날씨 설정 ===
 WEATHER_CITY = os.getenv("WEATHER_CITY", "Seoul")
 WEATHER_CITY_KR = os.getenv("WEATHER_CITY_KR", "서울")
@@ -37,26 +43,29 @@ _default_keywords = (
     "엔비디아,ETF,속보,정치,수출규제,"
     "관세,금값"
 )
-NEWS_KEYWORDS = [
+NEWS_KEYWORDS = tuple(
     k.strip() for k in os.getenv("NEWS_KEYWORDS", _default_keywords).split(",") if k.strip()
-]
+)
 NEWS_COUNT_PER_KEYWORD = int(os.getenv("NEWS_COUNT_PER_KEYWORD", "3"))
+# 키워드 동시 스크래핑 워커 수 (너무 크면 네이버 403 차단 위험)
+NEWS_SCRAPE_WORKERS = int(os.getenv("NEWS_SCRAPE_WORKERS", "4"))
 
 # 뉴스 스케줄: 쉼표로 구분된 시간 (환경변수로 변경 가능)
 _default_news_times = "08:00,18:00"
-NEWS_SCHEDULE_TIMES = [
+NEWS_SCHEDULE_TIMES = tuple(
     t.strip() for t in os.getenv("NEWS_SCHEDULE_TIMES", _default_news_times).split(",") if t.strip()
-]
+)
 
-# 뉴스 중복 필터링용 해시 파일
-NEWS_HASH_FILE = "news_sent_hashes.json"
+# 뉴스 중복 필터링용 해시 파일 (한 줄에 해시 1개, 오래된 순)
+NEWS_HASH_FILE = "news_sent_hashes.txt"
 
 # === 한국 주요 도시 매핑 ===
-CITY_MAP = {
+CITY_MAP = MappingProxyType({
     "서울": "Seoul", "부산": "Busan", "대구": "Daegu", "인천": "Incheon",
     "광주": "Gwangju", "대전": "Daejeon", "울산": "Ulsan", "세종": "Sejong",
     "수원": "Suwon", "성남": "Seongnam", "고양": "Goyang", "용인": "Yongin",
     "창원": "Changwon", "청주": "Cheongju", "전주": "Jeonju", "천안": "Cheonan",
     "제주": "Jeju", "김해": "Gimhae", "포항": "Pohang", "평택": "Pyeongtaek",
-}
-CITY_MAP_REV = {v.lower(): k for k, v in CITY_MAP.items()}
+})
+# 영문(casefold) → 한글 역매핑
+CITY_MAP_REV = MappingProxyType({v.casefold(): k for k, v in CITY_MAP.items()})
@@ -0,0 +1,29 @@
+"""
+json_codec.py - JSON 인코딩/디코딩 공용 헬퍼
+orjson이 설치되어 있으면 사용하고 (bytes 직접 파싱, 빠름),
+없으면 표준 json 모듈로 동작합니다.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경
+    orjson = None
+
+# orjson.JSONDecodeError도 json.JSONDecodeError의 하위 클래스
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str):
+    """JSON bytes/str → 파이썬 객체"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """파이썬 객체 → UTF-8 JSON bytes (한글 이스케이프 없음)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
@@ -16,7 +16,7 @@ from config import (
     NEWS_COUNT_PER_KEYWORD,
 )
 from news_scraper import scrape_all_keywords, format_news_for_telegram
-from telegram_sender import send_message
+from telegram_sender import send_message, wait_send_slot
 
 # 텔레그램 메시지 최대 길이
 MAX_MSG_LEN = 4096
@@ -31,19 +31,22 @@ def _split_message(text: str, max_len: int = MAX_MSG_LEN) -> list[str]:
         return [text]
 
     chunks = []
-    current = ""
+    buf: list[str] = []  # 현재 청크의 줄 목록 (flush 시에만 join)
+    buf_len = 0          # "\n".join(buf)의 길이
 
     for line in text.split("\n"):
-        candidate = current + "\n" + line if current else line
-        if len(candidate) <= max_len:
-            current = candidate
+        if not buf_len:
+            # 빈 청크는 새 줄로 교체 (앞쪽 빈 줄 제거)
+            buf, buf_len = [line], len(line)
+        elif buf_len + 1 + len(line) <= max_len:
+            buf.append(line)
+            buf_len += 1 + len(line)
         else:
-            if current:
-                chunks.append(current)
-            current = line
+            chunks.append("\n".join(buf))
+            buf, buf_len = [line], len(line)
 
-    if current:
-        chunks.append(current)
+    if buf_len:
+        chunks.append("\n".join(buf))
 
     return chunks
 
@@ -93,6 +96,8 @@ def send_news():
     success_count = 0
 
     for i, chunk in enumerate(chunks):
+        # 429 (Too Many Requests) 방지: 발송 간격 유지
+        wait_send_slot()
         result = send_message(token, channel_id, chunk)
         if result.get("ok"):
             success_count += 1
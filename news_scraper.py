@@ -2,31 +2,70 @@
 news_scraper.py - 네이버 뉴스 스크래퍼
 네이버 뉴스 검색에서 키워드 기반으로 뉴스를 수집합니다.
 2025~ 네이버 SDS 디자인 시스템 대응 + 레거시 폴백 지원.
-MD5 해시 기반 중복 필터링 포함.
+64비트 BLAKE2b 해시 기반 중복 필터링 포함.
 """
 
 import hashlib
-import json
 import random
 import re
 import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
+from typing import NamedTuple
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from config import NEWS_HASH_FILE
+from config import NEWS_HASH_FILE, NEWS_SCRAPE_WORKERS
+
+try:
+    import lxml  # noqa: F401  (BeautifulSoup 파서로만 사용)
+    _HTML_PARSER = "lxml"
+except ImportError:  # lxml 미설치 환경 → 내장 파서 (느림)
+    _HTML_PARSER = "html.parser"
 
 HASH_FILE = Path(NEWS_HASH_FILE)
+# 중복 판별용 해시 보관 개수 (오래된 것부터 제거)
+HASH_HISTORY_LIMIT = 2000
 
 # 조류인플루엔자(AI) 관련 제외 키워드
-_AVIAN_FLU_KEYWORDS = [
+_AVIAN_FLU_KEYWORDS = (
     "조류인플루엔자", "조류독감", "고병원성", "AI 방역", "AI 발생",
     "AI 확산", "살처분", "가금류", "닭·오리", "AI 의심",
     "AI 확진", "조류 인플루엔자", "H5N1", "H5N6", "H5N8",
     "AI 양성", "철새", "AI 역학", "구제역",
-]
+)
+
+# 조류인플루엔자 필터를 적용할 검색 키워드 (소문자, 공백 제거 기준)
+_AI_KEYWORDS = frozenset({"ai", "인공지능", "생성ai", "생성형ai", "ai반도체"})
+
+# 제외 키워드 전체를 한 번에 검사하는 정규식 (대소문자 무시)
+_AVIAN_FLU_RE = re.compile(
+    "|".join(re.escape(kw) for kw in _AVIAN_FLU_KEYWORDS), re.IGNORECASE
+)
+
+# 기사 컨테이너만 파싱 (head/script/광고/사이드바 등은 DOM 생성 생략)
+_NEWS_STRAINER = SoupStrainer(
+    ["div", "ul"],
+    class_=re.compile(r"fds-news-item-list-tab|list_news|news_area"),
+)
+
+# SDS 파서에서 건너뛸 링크 (Keep / 빈 href)
+_SDS_SKIP_HREFS = frozenset({"keep.naver.com", "#", ""})
+
+# 자주 쓰는 CSS 선택자 (호출마다 재파싱하지 않도록 미리 컴파일)
+_SEL_SDS_CONTAINER = sv.compile("div.fds-news-item-list-tab")
+_SEL_LIST_NEWS = sv.compile("ul.list_news")
+_SEL_A_HREF = sv.compile("a[href]")
+_SEL_PROFILE = sv.compile('[data-sds-comp="Profile"]')
+_SEL_PRESS = sv.compile("a.info.press")
+_SEL_NAVER_NEWS_LINK = sv.compile('a[href*="news.naver.com"]')
 
 HEADERS = {
     "User-Agent": (
@@ -38,60 +77,85 @@ HEADERS = {
     "Referer": "https://search.naver.com/",
 }
 
+# 네이버 요청 공용 세션 (병렬 스크래핑 간 연결 재사용)
+# 403 차단은 scrape_naver_news에서 별도 대기 후 재시도하므로 제외
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False),
+))
+
+
+class Article(NamedTuple):
+    """수집한 뉴스 기사 1건"""
+    title: str
+    link: str
+    press: str     # 언론사 (없으면 "")
+    summary: str   # 요약 (최대 120자, 없으면 "")
+
 
 def _article_hash(title: str, link: str) -> str:
-    """기사 제목+링크의 MD5 해시 생성 (중복 판별용)"""
+    """기사 제목+링크의 64비트 BLAKE2b 해시 생성 (중복 판별용, 16자리 hex)"""
+    raw = f"{title.strip()}|{link.strip()}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _legacy_article_hash(title: str, link: str) -> str:
+    """이전 버전의 MD5 기사 해시 (32자리 hex, 기존 해시 파일과 대조용)"""
     raw = f"{title.strip()}|{link.strip()}"
-    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return hashlib.md5(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
-def _load_sent_hashes() -> set:
-    """이전에 발송한 기사 해시 목록 로드"""
+def _load_sent_hashes() -> dict[str, None]:
+    """
+    이전에 발송한 기사 해시 목록 로드.
+    발송 순서를 유지하는 dict로 반환 (O(1) 조회 + 오래된 순 정리 가능).
+    """
     if not HASH_FILE.exists():
-        return set()
+        return {}
     try:
-        data = json.loads(HASH_FILE.read_text(encoding="utf-8"))
-        return set(data.get("hashes", []))
-    except (json.JSONDecodeError, KeyError):
-        return set()
+        return dict.fromkeys(HASH_FILE.read_text(encoding="ascii").split())
+    except UnicodeDecodeError:
+        return {}
 
 
-def _save_sent_hashes(hashes: set):
-    """발송한 기사 해시 저장 (최근 2000개만 유지)"""
-    hash_list = list(hashes)[-2000:]
-    HASH_FILE.write_text(
-        json.dumps({"updated": datetime.now().isoformat(), "hashes": hash_list},
-                    ensure_ascii=False),
-        encoding="utf-8",
-    )
+def _save_sent_hashes(hashes: dict[str, None]):
+    """발송한 기사 해시 저장 (최근 HASH_HISTORY_LIMIT개만 유지)"""
+    hash_list = list(hashes)[-HASH_HISTORY_LIMIT:]
+    HASH_FILE.write_text("\n".join(hash_list) + "\n", encoding="ascii")
 
 
-def _is_avian_flu(article: dict) -> bool:
+def _is_avian_flu(article: Article) -> bool:
     """조류인플루엔자 관련 기사인지 판별"""
-    text = f"{article.get('title', '')} {article.get('summary', '')}".lower()
-    return any(kw in text for kw in _AVIAN_FLU_KEYWORDS)
+    # 대부분 제목에서 걸러지므로 짧은 제목을 먼저 검사
+    return (_AVIAN_FLU_RE.search(article.title) is not None
+            or _AVIAN_FLU_RE.search(article.summary) is not None)
 
 
-def scrape_naver_news(keyword: str, count: int = 5) -> list[dict]:
+def scrape_naver_news(keyword: str, count: int = 5) -> list[Article]:
     """
     네이버 뉴스에서 키워드로 뉴스를 검색합니다.
     여러 전략(SDS 신규 디자인 / 레거시)을 시도하여 안정적으로 추출합니다.
     인공지능/AI 키워드 검색 시 조류인플루엔자 기사를 자동 제외합니다.
 
     Returns:
-        list[dict]: [{"title", "link", "press", "summary"}, ...]
+        list[Article]: [Article(title, link, press, summary), ...]
     """
     url = "https://search.naver.com/search.naver"
     params = {"where": "news", "query": keyword, "sort": "1"}  # sort=1: 최신순
 
     # 최대 2회 재시도 (403 차단 대응)
-    soup = None
+    html = None
     resp = None
     for attempt in range(3):
         try:
-            resp = requests.get(url, params=params, headers=HEADERS, timeout=15)
+            resp = _SESSION.get(url, params=params, timeout=15)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
+            html = resp.content  # bytes 그대로 파서에 전달 (인코딩은 meta charset으로 감지)
             break
         except requests.RequestException as e:
             if resp is not None and resp.status_code == 403 and attempt < 2:
@@ -102,9 +166,12 @@ def scrape_naver_news(keyword: str, count: int = 5) -> list[dict]:
             print(f"[ERROR] '{keyword}' 뉴스 요청 실패: {e}")
             return []
 
-    if soup is None:
+    if html is None:
         return []
 
+    # SDS/레거시 파서는 기사 컨테이너만 필요하므로 부분 파싱
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_NEWS_STRAINER)
+
     # 여유분 확보 (필터링으로 감소할 수 있으므로)
     fetch_count = count + 5
 
@@ -115,13 +182,12 @@ def scrape_naver_news(keyword: str, count: int = 5) -> list[dict]:
     if not articles:
         articles = _parse_legacy(soup, fetch_count)
 
-    # 전략 3: 범용 링크 기반 추출
+    # 전략 3: 범용 링크 기반 추출 (페이지 전체 탐색 필요 → 전체 파싱)
     if not articles:
-        articles = _parse_generic(soup, fetch_count)
+        articles = _parse_generic(BeautifulSoup(html, _HTML_PARSER), fetch_count)
 
     # 조류인플루엔자 필터: AI/인공지능 관련 키워드일 때 적용
-    ai_keywords = {"ai", "인공지능", "생성ai", "생성형ai", "ai반도체"}
-    if keyword.lower().replace(" ", "") in ai_keywords:
+    if keyword.lower().replace(" ", "") in _AI_KEYWORDS:
         filtered = [a for a in articles if not _is_avian_flu(a)]
         removed = len(articles) - len(filtered)
         if removed > 0:
@@ -131,7 +197,7 @@ def scrape_naver_news(keyword: str, count: int = 5) -> list[dict]:
     return articles[:count]
 
 
-def _parse_sds(soup: BeautifulSoup, count: int) -> list[dict]:
+def _parse_sds(soup: BeautifulSoup, count: int) -> list[Article]:
     """
     SDS 디자인 시스템 파서 (2025~ 네이버 검색 UI).
     Profile 요소([data-sds-comp="Profile"])를 기사 경계로 사용하여
@@ -140,26 +206,23 @@ def _parse_sds(soup: BeautifulSoup, count: int) -> list[dict]:
     results = []
 
     # 뉴스 카드 컨테이너 찾기
-    container = soup.select_one("div.fds-news-item-list-tab")
+    container = _SEL_SDS_CONTAINER.select_one(soup)
     if not container:
-        container = soup.select_one("ul.list_news")
+        container = _SEL_LIST_NEWS.select_one(soup)
     if not container:
         return results
 
-    all_links = container.select("a[href]")
-    if not all_links:
+    if _SEL_A_HREF.select_one(container) is None:
         return results
 
     # Profile 요소의 위치를 기준으로 기사 경계 설정
     # 각 Profile은 기사 시작을 의미함
-    profiles = container.select('[data-sds-comp="Profile"]')
+    profiles = _SEL_PROFILE.select(container)
     if not profiles:
         return results
 
     # Profile의 부모에서 언론사 이름이 포함된 텍스트 링크 찾기
     # 각 Profile 요소를 기준으로 기사 단위 파싱
-    _SKIP = {"keep.naver.com", "#", ""}
-
     for profile in profiles:
         if len(results) >= count:
             break
@@ -169,7 +232,8 @@ def _parse_sds(soup: BeautifulSoup, count: int) -> list[dict]:
         if not article_el or not article_el.name:
             continue
 
-        links = article_el.select("a[href]")
+        # 요약까지 찾으면 중단하므로 지연 순회 (Keep/공유/관련 링크 등 나머지는 건너뜀)
+        links = _SEL_A_HREF.iselect(article_el)
 
         press = ""
         title = ""
@@ -177,13 +241,16 @@ def _parse_sds(soup: BeautifulSoup, count: int) -> list[dict]:
         summary = ""
 
         for a in links:
-            href = a.get("href", "").strip()
-            text = a.get_text(strip=True)
+            href = a.attrs.get("href", "").strip()
 
-            # Keep / 빈 href 스킵
-            if href in _SKIP or "keep.naver.com" in href:
+            # Keep / 빈 href 스킵 (텍스트 추출 전에 먼저 걸러냄)
+            if href in _SDS_SKIP_HREFS or "keep.naver.com" in href:
                 continue
 
+            # 단일 문자열 링크는 .string으로 바로 (하위 노드 순회 생략)
+            string = a.string
+            text = string.strip() if string is not None else a.get_text(strip=True)
+
             # 빈 텍스트 스킵
             if not text:
                 continue
@@ -207,56 +274,48 @@ def _parse_sds(soup: BeautifulSoup, count: int) -> list[dict]:
                 continue
 
             # 요약: 두 번째 콘텐츠 링크 (20자 이상)
+            # 제목/요약이 모두 정해지면 이후 링크는 결과에 영향 없음
             if title and not summary and len(text) >= 10:
                 summary = text
-                continue
+                break
 
         if title and link:
-            results.append({
-                "title": title,
-                "link": link,
-                "press": press,
-                "summary": summary[:120] if summary else "",
-            })
+            results.append(Article(title, link, press, summary[:120]))
 
     return results
 
 
-def _parse_legacy(soup: BeautifulSoup, count: int) -> list[dict]:
+def _parse_legacy(soup: BeautifulSoup, count: int) -> list[Article]:
     """레거시 디자인 파서 (div.news_area 기반)"""
     results = []
-    articles = soup.select("div.news_area")[:count]
+    articles = soup.find_all("div", class_="news_area", limit=count)
 
     for article in articles:
-        title_tag = article.select_one("a.news_tit")
+        title_tag = article.find("a", class_="news_tit")
         if not title_tag:
             continue
 
         title = title_tag.get_text(strip=True)
         link = title_tag.get("href", "")
 
-        press_tag = article.select_one("a.info.press")
+        # 클래스 2개 조건은 find(class_=...)로 순서 무관 매칭이 안 되므로 선택자 사용
+        press_tag = _SEL_PRESS.select_one(article)
         press = press_tag.get_text(strip=True) if press_tag else ""
 
-        summary_tag = article.select_one("div.news_dsc")
+        summary_tag = article.find("div", class_="news_dsc")
         summary = summary_tag.get_text(strip=True)[:120] if summary_tag else ""
 
-        results.append({
-            "title": title,
-            "link": link,
-            "press": press,
-            "summary": summary,
-        })
+        results.append(Article(title, link, press, summary))
 
     return results
 
 
-def _parse_generic(soup: BeautifulSoup, count: int) -> list[dict]:
+def _parse_generic(soup: BeautifulSoup, count: int) -> list[Article]:
     """범용 폴백 파서: news.naver.com 링크를 직접 탐색"""
     results = []
     seen_links = set()
 
-    for a_tag in soup.select('a[href*="news.naver.com"]'):
+    for a_tag in _SEL_NAVER_NEWS_LINK.select(soup):
         href = a_tag.get("href", "")
         text = a_tag.get_text(strip=True)
 
@@ -268,12 +327,7 @@ def _parse_generic(soup: BeautifulSoup, count: int) -> list[dict]:
             continue
 
         seen_links.add(href)
-        results.append({
-            "title": text,
-            "link": href,
-            "press": "",
-            "summary": "",
-        })
+        results.append(Article(text, href, "", ""))
 
         if len(results) >= count:
             break
@@ -281,32 +335,53 @@ def _parse_generic(soup: BeautifulSoup, count: int) -> list[dict]:
     return results
 
 
-def scrape_all_keywords(keywords: list[str], count_per: int = 5) -> dict[str, list[dict]]:
+def warm_up():
+    """발송 직전 예열: 네이버 검색 서버와 TLS 연결을 미리 맺어 둡니다 (실패 무시)"""
+    try:
+        _SESSION.head("https://search.naver.com/", timeout=3)
+    except requests.RequestException as e:
+        print(f"[뉴스] 예열 실패 (무시): {e}", flush=True)
+
+
+def _scrape_with_jitter(keyword: str, count: int) -> list[Article]:
+    """요청 시작 시점을 랜덤하게 분산한 뒤 스크래핑 (동시 요청 버스트 → 403 차단 방지)"""
+    time.sleep(random.uniform(0.0, 1.5))
+    return scrape_naver_news(keyword, count=count)
+
+
+def scrape_all_keywords(keywords: Sequence[str], count_per: int = 5) -> dict[str, list[Article]]:
     """
     여러 키워드를 한 번에 스크래핑합니다.
-    중복 기사를 MD5 해시로 필터링합니다.
-    네이버 차단 방지를 위해 요청 간 랜덤 딜레이를 적용합니다.
+    키워드별 요청은 스레드 풀에서 병렬로 실행하고 (요청마다 랜덤 지연),
+    중복 기사는 키워드 순서대로 기사 해시로 필터링합니다.
 
     Returns:
         dict: {키워드: [기사 목록], ...}
     """
     sent_hashes = _load_sent_hashes()
+    # MD5 시절 해시가 남아 있으면 함께 대조 (업그레이드 직후 이미 보낸 기사 재발송 방지)
+    check_legacy = any(len(h) == 32 for h in sent_hashes)
     all_results = {}
-    new_hashes = set()
-
-    for idx, keyword in enumerate(keywords):
-        # 네이버 403 차단 방지: 요청 간 1~3초 랜덤 딜레이
-        if idx > 0:
-            delay = random.uniform(1.0, 3.0)
-            time.sleep(delay)
-        raw_articles = scrape_naver_news(keyword, count=count_per + 3)  # 여유분
+    new_hashes = {}  # 순서 유지 (저장 시 최신 해시가 뒤에 오도록)
+
+    # 네트워크 대기가 대부분이므로 병렬 요청 (결과는 키워드 순서 유지)
+    workers = max(1, min(NEWS_SCRAPE_WORKERS, len(keywords)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+        raw_results = list(pool.map(
+            lambda kw: _scrape_with_jitter(kw, count_per + 3), keywords  # 여유분
+        ))
+
+    for keyword, raw_articles in zip(keywords, raw_results):
         filtered = []
 
         for article in raw_articles:
-            h = _article_hash(article["title"], article["link"])
+            h = _article_hash(article.title, article.link)
+            if check_legacy and h not in sent_hashes and \
+                    _legacy_article_hash(article.title, article.link) in sent_hashes:
+                sent_hashes[h] = None  # 이미 보낸 기사 → 새 해시로 이어서 기록
             if h not in sent_hashes and h not in new_hashes:
                 filtered.append(article)
-                new_hashes.add(h)
+                new_hashes[h] = None
 
             if len(filtered) >= count_per:
                 break
@@ -322,7 +397,7 @@ def scrape_all_keywords(keywords: list[str], count_per: int = 5) -> dict[str, li
     return all_results
 
 
-def format_news_for_telegram(all_news: dict[str, list[dict]]) -> str:
+def format_news_for_telegram(all_news: dict[str, list[Article]]) -> str:
     """
     키워드별 뉴스를 텔레그램 HTML 메시지로 변환합니다.
 
@@ -335,44 +410,38 @@ def format_news_for_telegram(all_news: dict[str, list[dict]]) -> str:
     now = datetime.now()
     time_label = "오전" if now.hour < 12 else "오후"
     date_str = now.strftime("%Y-%m-%d")
+    total_count = sum(len(articles) for articles in all_news.values())
 
-    lines = [
-        f"<b>📰 네이버 뉴스 브리핑</b>  ({date_str} {time_label})",
-        "",
-    ]
+    return "\n".join(chain(
+        (f"<b>📰 네이버 뉴스 브리핑</b>  ({date_str} {time_label})", ""),
+        chain.from_iterable(
+            _format_keyword_lines(keyword, articles)
+            for keyword, articles in all_news.items()
+        ),
+        (f"📊 총 {total_count}건",),
+    ))
 
-    total_count = 0
 
-    for keyword, articles in all_news.items():
-        if not articles:
-            lines.append(f"🔹 <b>{keyword}</b> — 새로운 뉴스 없음")
-            lines.append("")
-            continue
-
-        lines.append(f"🔹 <b>{keyword}</b>")
-
-        for i, art in enumerate(articles, 1):
-            press_str = f" [{art['press']}]" if art.get("press") else ""
-            title_escaped = _escape_html(art["title"])
-            lines.append(
-                f'  {i}. <a href="{art["link"]}">{title_escaped}</a>{press_str}'
-            )
-            if art.get("summary"):
-                summary_escaped = _escape_html(art["summary"][:80])
-                lines.append(f"     {summary_escaped}")
+def _format_keyword_lines(keyword: str, articles: list[Article]):
+    """키워드 1개 블록의 메시지 줄 생성 (마지막 빈 줄 포함)"""
+    if not articles:
+        yield f"🔹 <b>{keyword}</b> — 새로운 뉴스 없음"
+        yield ""
+        return
 
-        lines.append("")
-        total_count += len(articles)
+    yield f"🔹 <b>{keyword}</b>"
+    for i, art in enumerate(articles, 1):
+        press_str = f" [{art.press}]" if art.press else ""
+        yield f'  {i}. <a href="{art.link}">{_escape_html(art.title)}</a>{press_str}'
+        if art.summary:
+            yield f"     {_escape_html(art.summary[:80])}"
+    yield ""
 
-    lines.append(f"📊 총 {total_count}건")
 
-    return "\n".join(lines)
+# 텔레그램 HTML 특수문자 변환표
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
 
 
 def _escape_html(text: str) -> str:
     """텔레그램 HTML에서 특수문자 이스케이프"""
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-    )
+    return text.translate(_HTML_ESCAPE_TABLE)
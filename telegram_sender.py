@@ -1,10 +1,56 @@
 """텔레그램 메시지 발송 핵심 모듈"""
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-HISTORY_FILE = Path(__file__).parent / "send_history.json"
+import json_codec
+
+# 발송 이력 (JSON Lines, 한 줄에 1건 append)
+HISTORY_FILE = Path(__file__).parent / "send_history.jsonl"
+HISTORY_KEEP = 500          # 정리 후 남길 최근 이력 수
+HISTORY_COMPACT_AT = 5000   # 이 줄 수를 넘으면 정리
+
+# 텔레그램 API 공용 세션 (연속 발송 시 TLS 연결 재사용)
+# 재시도는 일시 오류만, POST는 연결 실패 시에만 (중복 발송 방지)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False),
+))
+
+# 발송 속도 제한 (텔레그램 초당 30건 제한 + 여유)
+SEND_INTERVAL_SEC = 1 / 28.0
+_send_slot_lock = threading.Lock()
+_next_send_at = 0.0
+
+# 발송 이력 기록 대기열 (백그라운드 스레드가 모아서 파일에 씀 → 발송 경로에서 디스크 I/O 제거)
+HISTORY_BATCH_MAX = 100
+_history_queue: queue.Queue = queue.Queue()
+_history_lines = None  # 현재 이력 파일 줄 수 (기록 스레드만 사용, 첫 기록 시 계산)
+
+
+def wait_send_slot():
+    """
+    다음 발송 가능 시점까지 대기합니다.
+    여러 스레드에서 호출해도 전체 발송 간격이 SEND_INTERVAL_SEC 이상으로 유지됩니다.
+    """
+    global _next_send_at
+    with _send_slot_lock:
+        now = time.monotonic()
+        slot = max(now, _next_send_at)
+        _next_send_at = slot + SEND_INTERVAL_SEC
+    if slot > now:
+        time.sleep(slot - now)
 
 
 def send_message(token: str, chat_id: str, text: str, parse_mode: str = "HTML",
@@ -30,7 +76,7 @@ def send_message(token: str, chat_id: str, text: str, parse_mode: str = "HTML",
     if reply_to_message_id:
         payload["reply_to_message_id"] = reply_to_message_id
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = _SESSION.post(url, json=payload, timeout=10)
         result = response.json()
         # 발송 이력 저장
         _save_history(chat_id, text, result.get("ok", False))
@@ -45,7 +91,7 @@ def send_photo(token: str, chat_id: str, photo_path: str, caption: str = "") ->
     with open(photo_path, "rb") as photo:
         files = {"photo": photo}
         data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
-        response = requests.post(url, data=data, files=files, timeout=30)
+        response = _SESSION.post(url, data=data, files=files, timeout=30)
     return response.json()
 
 
@@ -55,7 +101,7 @@ def send_document(token: str, chat_id: str, doc_path: str, caption: str = "") ->
     with open(doc_path, "rb") as doc:
         files = {"document": doc}
         data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
-        response = requests.post(url, data=data, files=files, timeout=30)
+        response = _SESSION.post(url, data=data, files=files, timeout=30)
     return response.json()
 
 
@@ -65,7 +111,7 @@ def send_video(token: str, chat_id: str, video_path: str, caption: str = "") ->
     with open(video_path, "rb") as video:
         files = {"video": video}
         data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
-        response = requests.post(url, data=data, files=files, timeout=60)
+        response = _SESSION.post(url, data=data, files=files, timeout=60)
     return response.json()
 
 
@@ -75,7 +121,7 @@ def send_animation(token: str, chat_id: str, gif_path: str, caption: str = "") -
     with open(gif_path, "rb") as animation:
         files = {"animation": animation}
         data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
-        response = requests.post(url, data=data, files=files, timeout=30)
+        response = _SESSION.post(url, data=data, files=files, timeout=30)
     return response.json()
 
 
@@ -85,7 +131,7 @@ def send_voice(token: str, chat_id: str, voice_path: str, caption: str = "") ->
     with open(voice_path, "rb") as voice:
         files = {"voice": voice}
         data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
-        response = requests.post(url, data=data, files=files, timeout=30)
+        response = _SESSION.post(url, data=data, files=files, timeout=30)
     return response.json()
 
 
@@ -93,7 +139,7 @@ def send_location(token: str, chat_id: str, latitude: float, longitude: float) -
     """위치 공유"""
     url = f"https://api.telegram.org/bot{token}/sendLocation"
     payload = {"chat_id": chat_id, "latitude": latitude, "longitude": longitude}
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def send_poll(token: str, chat_id: str, question: str, options: list[str],
@@ -114,21 +160,21 @@ def send_poll(token: str, chat_id: str, question: str, options: list[str],
         "is_anonymous": is_anonymous,
         "type": poll_type,
     }
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def forward_message(token: str, chat_id: str, from_chat_id: str, message_id: int) -> dict:
     """메시지 전달 (원본 발신자 표시)"""
     url = f"https://api.telegram.org/bot{token}/forwardMessage"
     payload = {"chat_id": chat_id, "from_chat_id": from_chat_id, "message_id": message_id}
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def copy_message(token: str, chat_id: str, from_chat_id: str, message_id: int) -> dict:
     """메시지 복사 (원본 발신자 숨김)"""
     url = f"https://api.telegram.org/bot{token}/copyMessage"
     payload = {"chat_id": chat_id, "from_chat_id": from_chat_id, "message_id": message_id}
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def edit_message(token: str, chat_id: str, message_id: int, new_text: str,
@@ -139,14 +185,14 @@ def edit_message(token: str, chat_id: str, message_id: int, new_text: str,
         "chat_id": chat_id, "message_id": message_id,
         "text": new_text, "parse_mode": parse_mode,
     }
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def delete_message(token: str, chat_id: str, message_id: int) -> dict:
     """메시지 삭제 (48시간 이내만 가능)"""
     url = f"https://api.telegram.org/bot{token}/deleteMessage"
     payload = {"chat_id": chat_id, "message_id": message_id}
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def pin_message(token: str, chat_id: str, message_id: int,
@@ -157,25 +203,25 @@ def pin_message(token: str, chat_id: str, message_id: int,
         "chat_id": chat_id, "message_id": message_id,
         "disable_notification": disable_notification,
     }
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def get_me(token: str) -> dict:
     """봇 정보 조회 (이름, 사용자명, 권한 등)"""
     url = f"https://api.telegram.org/bot{token}/getMe"
-    return requests.get(url, timeout=10).json()
+    return _SESSION.get(url, timeout=10).json()
 
 
 def get_chat(token: str, chat_id: str) -> dict:
     """채팅/채널/그룹 정보 조회"""
     url = f"https://api.telegram.org/bot{token}/getChat"
-    return requests.post(url, json={"chat_id": chat_id}, timeout=10).json()
+    return _SESSION.post(url, json={"chat_id": chat_id}, timeout=10).json()
 
 
 def get_chat_member_count(token: str, chat_id: str) -> dict:
     """그룹/채널 멤버 수 조회"""
     url = f"https://api.telegram.org/bot{token}/getChatMemberCount"
-    return requests.post(url, json={"chat_id": chat_id}, timeout=10).json()
+    return _SESSION.post(url, json={"chat_id": chat_id}, timeout=10).json()
 
 
 def answer_callback_query(token: str, callback_query_id: str,
@@ -186,58 +232,105 @@ def answer_callback_query(token: str, callback_query_id: str,
         "callback_query_id": callback_query_id,
         "text": text, "show_alert": show_alert,
     }
-    return requests.post(url, json=payload, timeout=10).json()
+    return _SESSION.post(url, json=payload, timeout=10).json()
 
 
 def broadcast(token: str, chat_ids: list[str], text: str) -> dict:
     """
-    다채널 동시 발송
+    다채널 동시 발송 (스레드 풀 병렬 발송, 초당 발송 건수 제한 준수)
     Returns:
         dict: {"success": [...], "failed": [...]}
     """
     results = {"success": [], "failed": []}
-    for chat_id in chat_ids:
-        result = send_message(token, chat_id, text)
-        if result.get("ok"):
-            results["success"].append(chat_id)
-        else:
-            results["failed"].append({
-                "chat_id": chat_id,
-                "error": result.get("description", "Unknown error")
-            })
+    if not chat_ids:
+        return results
+
+    def _send(chat_id: str) -> tuple[str, dict]:
+        wait_send_slot()
+        return chat_id, send_message(token, chat_id, text)
+
+    with ThreadPoolExecutor(max_workers=min(20, len(chat_ids))) as pool:
+        for chat_id, result in pool.map(_send, chat_ids):
+            if result.get("ok"):
+                results["success"].append(chat_id)
+            else:
+                results["failed"].append({
+                    "chat_id": chat_id,
+                    "error": result.get("description", "Unknown error")
+                })
     return results
 
 
 def _save_history(chat_id: str, text: str, success: bool):
-    """발송 이력을 JSON 파일에 저장"""
-    history = []
-    if HISTORY_FILE.exists():
-        try:
-            history = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            history = []
-
-    history.append({
+    """발송 이력을 기록 대기열에 추가 (파일 기록은 백그라운드 스레드에서)"""
+    _history_queue.put({
         "timestamp": datetime.now().isoformat(),
         "chat_id": chat_id,
         "text": text[:100] + "..." if len(text) > 100 else text,
         "success": success,
     })
 
-    # 최근 500건만 보관
-    history = history[-500:]
-    HISTORY_FILE.write_text(
-        json.dumps(history, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+
+def _history_writer():
+    """
+    대기열의 발송 이력을 최대 HISTORY_BATCH_MAX건씩 모아 JSONL 파일 끝에 추가합니다.
+    줄 수가 HISTORY_COMPACT_AT을 넘으면 최근 HISTORY_KEEP건만 남기고 정리합니다.
+    """
+    global _history_lines
+    while True:
+        batch = [_history_queue.get()]
+        while len(batch) < HISTORY_BATCH_MAX:
+            try:
+                batch.append(_history_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _append_history(batch)
+        except Exception as e:
+            # 어떤 오류로도 기록 스레드가 죽으면 join()이 영원히 대기하므로 배치 단위로 흡수
+            _history_lines = None  # 다음 배치에서 줄 수를 다시 셈
+            print(f"[history] 발송 이력 저장 실패: {e}", flush=True)
+        finally:
+            for _ in batch:
+                _history_queue.task_done()
+
+
+def _append_history(entries: list[dict]):
+    global _history_lines
+    if _history_lines is None:
+        _history_lines = _count_history_lines()
+
+    with HISTORY_FILE.open("ab") as f:
+        f.write(b"".join(json_codec.dumps(e) + b"\n" for e in entries))
+    _history_lines += len(entries)
+
+    if _history_lines > HISTORY_COMPACT_AT:
+        lines = HISTORY_FILE.read_bytes().splitlines(keepends=True)[-HISTORY_KEEP:]
+        HISTORY_FILE.write_bytes(b"".join(lines))
+        _history_lines = len(lines)
+
+
+def _count_history_lines() -> int:
+    """이력 파일의 현재 줄 수"""
+    if not HISTORY_FILE.exists():
+        return 0
+    return HISTORY_FILE.read_bytes().count(b"\n")
 
 
 def get_history(limit: int = 50) -> list:
-    """발송 이력 조회"""
+    """발송 이력 조회 (최근 limit건, 손상된 줄은 건너뜀)"""
+    _history_queue.join()  # 아직 기록 중인 이력 반영
     if not HISTORY_FILE.exists():
         return []
-    try:
-        history = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-        return history[-limit:]
-    except json.JSONDecodeError:
-        return []
+    history = []
+    for line in HISTORY_FILE.read_bytes().splitlines()[-limit:]:
+        try:
+            history.append(json_codec.loads(line))
+        except json_codec.JSONDecodeError:
+            continue
+    return history
+
+
+threading.Thread(target=_history_writer, name="history-writer", daemon=True).start()
+# 종료 시 대기 중인 이력까지 기록
+atexit.register(_history_queue.join)
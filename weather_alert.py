@@ -1,34 +1,83 @@
 """
 weather_alert.py - 매일 오전 날씨 알림 발송 스크립트
-Open-Meteo(기본) + wttr.in(fallback) 이중 API로 안정적 날씨 조회.
+Open-Meteo + wttr.in 이중 API를 동시에 요청하여 빠르고 안정적으로 날씨 조회.
 위치 설정: weather_location.json (텔레그램 /위치 명령으로 변경 가능)
 """
 
-import json
+import os
 import sys
+import threading
 import time
+from bisect import bisect_right
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
 import requests
-from config import TELEGRAM_BOT_TOKEN, CHAT_IDS, WEATHER_CITY, WEATHER_CITY_KR, CITY_MAP
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import json_codec
+from config import TELEGRAM_BOT_TOKEN, CHAT_IDS, WEATHER_CITY, WEATHER_CITY_KR, CITY_MAP_REV
 from telegram_sender import send_message
 
 LOCATION_FILE = Path(__file__).parent / "weather_location.json"
-
-# WMO 날씨 코드 → 설명
-_WMO = {
-    0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-    45: "Fog", 48: "Rime fog",
-    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-    71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
-    80: "Slight showers", 81: "Moderate showers", 82: "Violent showers",
-    95: "Thunderstorm", 96: "Thunderstorm with hail", 99: "Thunderstorm with hail",
+# IP 자동 감지 결과 재사용 기간 (서버 IP는 거의 바뀌지 않음)
+AUTO_DETECT_TTL_SEC = 24 * 3600
+# 위치 설정 파일 쓰기 직렬화 (bot_commands의 /위치 저장과 공유)
+_location_lock = threading.Lock()
+# 도시명 → 좌표 캐시 (도시 설정은 거의 바뀌지 않으므로 지오코딩 요청 생략)
+CITY_GEOCODE_CACHE_FILE = Path(__file__).parent / "city_geocode_cache.json"
+
+# 날씨/위치 API 공용 세션 (Open-Meteo·wttr.in·ipinfo 연결 재사용)
+# 어댑터 재시도는 연결 실패·게이트웨이 오류만 (read=0: 읽기 타임아웃은 재시도하지 않아
+# 호출부 timeout이 전체 대기 시간의 상한이 되고, wttr.in 자체 재시도와 겹쳐 불어나지 않음)
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "weather-bot/1.0"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.5,
+                      status_forcelist=[502, 503, 504],
+                      raise_on_status=False),
+))
+
+# 완성된 날씨 메시지 캐시: (city, city_kr, 날짜) → (생성 시각, 메시지)
+MESSAGE_CACHE_TTL_SEC = 600
+_message_cache: dict[tuple[str, str, str], tuple[float, str]] = {}
+_message_cache_lock = threading.Lock()
+
+# 날씨 API 동시 요청용 스레드 풀 (Open-Meteo / wttr.in)
+_FETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather")
+
+# wttr.in은 curl UA일 때 응답이 안정적
+_WTTR_HEADERS = {"User-Agent": "curl/7.68.0", "Accept": "application/json"}
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 강수확률 표시 시각 (오전/오후/저녁) — 이 구간의 시간별 데이터만 요청
+_RAIN_HOURS = (9, 15, 21)
+
+# WMO 날씨 코드 → 이모지 (Open-Meteo weather_code)
+_WMO_EMOJI_MAP = {
+    0: "☀️", 1: "☀️",  # 맑음 / 대체로 맑음
+    2: "⛅",  # 구름 조금
+    3: "☁️",  # 흐림
+    45: "🌫️", 48: "🌫️",  # 안개 / 서리 안개
+    51: "🌧️", 53: "🌧️", 55: "🌧️",  # 이슬비
+    61: "🌧️", 63: "🌧️", 65: "🌧️",  # 비
+    71: "❄️", 73: "❄️", 75: "❄️",  # 눈
+    80: "🌧️", 81: "🌧️", 82: "🌧️",  # 소나기
+    95: "⛈️", 96: "⛈️", 99: "⛈️",  # 뇌우 (우박 포함)
 }
+_DEFAULT_WEATHER_EMOJI = "🌤️"
+# 코드(0~99)를 인덱스로 바로 조회하는 표 (정의되지 않은 코드는 기본 이모지)
+_WMO_EMOJI = tuple(_WMO_EMOJI_MAP.get(code, _DEFAULT_WEATHER_EMOJI) for code in range(100))
 
 
 # ──────────────────────────────────────────────
@@ -42,19 +91,13 @@ def load_location() -> tuple[str, str]:
     """
     if LOCATION_FILE.exists():
         try:
-            data = json.loads(LOCATION_FILE.read_text(encoding="utf-8"))
+            data = json_codec.loads(LOCATION_FILE.read_bytes())
             mode = data.get("mode", "manual")
 
             if mode == "auto":
-                loc = _detect_by_ip()
-                if loc:
-                    city = loc["city"]
-                    city_kr = next(
-                        (kr for kr, en in CITY_MAP.items()
-                         if en.lower() == city.lower()),
-                        city,
-                    )
-                    return city, city_kr
+                city = _auto_detected_city(data)
+                if city:
+                    return city, CITY_MAP_REV.get(city.casefold(), city)
 
             if mode == "gps":
                 lat = data.get("lat")
@@ -68,12 +111,52 @@ def load_location() -> tuple[str, str]:
     return WEATHER_CITY, WEATHER_CITY_KR
 
 
+def _auto_detected_city(data: dict) -> str | None:
+    """
+    자동 모드 도시 조회.
+    최근 AUTO_DETECT_TTL_SEC 이내 감지 결과가 있으면 IP 조회 없이 재사용하고,
+    새로 감지하면 weather_location.json에 기록합니다. 감지 실패 시 이전 결과 사용.
+    """
+    cached = data.get("auto_detected") or {}
+    if cached.get("city") and time.time() - cached.get("ts", 0) < AUTO_DETECT_TTL_SEC:
+        return cached["city"]
+
+    loc = _detect_by_ip()
+    if not loc:
+        return cached.get("city")
+
+    detected = {"city": loc["city"], "ts": time.time()}
+    try:
+        with _location_lock:
+            # IP 조회 중 /위치 로 설정이 바뀌었을 수 있으므로 다시 읽고, 자동 모드일 때만 기록
+            current = json_codec.loads(LOCATION_FILE.read_bytes())
+            if current.get("mode") == "auto":
+                current["auto_detected"] = detected
+                _write_location_file(current)
+    except (OSError, json_codec.JSONDecodeError) as e:
+        print(f"[위치] 자동 감지 결과 저장 실패: {e}", flush=True)
+    return loc["city"]
+
+
+def write_location(data: dict):
+    """위치 설정 파일 저장 (다른 쓰기와 직렬화)"""
+    with _location_lock:
+        _write_location_file(data)
+
+
+def _write_location_file(data: dict):
+    """임시 파일에 쓴 뒤 교체 → 쓰기 도중 종료돼도 설정 파일 손상 없음 (_location_lock 안에서 호출)"""
+    tmp = LOCATION_FILE.with_suffix(".tmp")
+    tmp.write_bytes(json_codec.dumps(data, indent=True))
+    os.replace(tmp, LOCATION_FILE)
+
+
 def _detect_by_ip() -> dict | None:
     """IP 기반 위치 감지"""
     try:
-        resp = requests.get("https://ipinfo.io/json", timeout=10)
+        resp = _SESSION.get("https://ipinfo.io/json", timeout=10)
         resp.raise_for_status()
-        info = resp.json()
+        info = json_codec.loads(resp.content)
         return {"city": info.get("city", "Seoul"), "region": info.get("region", "")}
     except Exception:
         return None
@@ -83,8 +166,25 @@ def _detect_by_ip() -> dict | None:
 # 날씨 API: Open-Meteo (기본, 빠름, 무료)
 # ──────────────────────────────────────────────
 
+def _load_city_geocode_cache() -> dict:
+    """디스크에 저장된 도시 지오코딩 캐시를 로드합니다."""
+    if CITY_GEOCODE_CACHE_FILE.exists():
+        try:
+            return json_codec.loads(CITY_GEOCODE_CACHE_FILE.read_bytes())
+        except (json_codec.JSONDecodeError, OSError):
+            pass
+    return {}
+
+
+_city_geocode_cache = _load_city_geocode_cache()
+_city_geocode_lock = threading.Lock()
+
+
 def _geocode_city(city: str) -> tuple[float, float, str]:
-    """도시명 → (위도, 경도, 표시이름). 좌표 형식이면 그대로 파싱."""
+    """
+    도시명 → (위도, 경도, 표시이름). 좌표 형식이면 그대로 파싱.
+    한 번 조회한 도시는 디스크 캐시에서 바로 반환합니다.
+    """
     # "37.5,126.9" 형식 (GPS 모드)
     if "," in city:
         parts = city.split(",")
@@ -93,13 +193,34 @@ def _geocode_city(city: str) -> tuple[float, float, str]:
         except ValueError:
             pass
 
-    resp = requests.get(
+    cached = _city_geocode_cache.get(city)
+    if cached:
+        lat, lon, name = cached
+        return lat, lon, name
+
+    result = _fetch_geocode_city(city)
+
+    with _city_geocode_lock:
+        _city_geocode_cache[city] = list(result)
+        # 임시 파일에 쓴 뒤 교체 (저장 실패해도 조회한 좌표는 그대로 사용)
+        try:
+            tmp = CITY_GEOCODE_CACHE_FILE.with_suffix(".tmp")
+            tmp.write_bytes(json_codec.dumps(_city_geocode_cache))
+            os.replace(tmp, CITY_GEOCODE_CACHE_FILE)
+        except OSError as e:
+            print(f"[날씨] 도시 좌표 캐시 저장 실패: {e}", flush=True)
+    return result
+
+
+def _fetch_geocode_city(city: str) -> tuple[float, float, str]:
+    """Open-Meteo 지오코딩 API로 도시 좌표 조회"""
+    resp = _SESSION.get(
         "https://geocoding-api.open-meteo.com/v1/search",
         params={"name": city, "count": 1, "language": "ko"},
         timeout=10,
     )
     resp.raise_for_status()
-    results = resp.json().get("results")
+    results = json_codec.loads(resp.content).get("results")
     if not results:
         raise ValueError(f"도시 '{city}'를 찾을 수 없습니다")
     loc = results[0]
@@ -111,24 +232,41 @@ def get_weather_openmeteo(city: str) -> dict:
     Open-Meteo API에서 날씨를 가져옵니다.
     무료, API 키 불필요, 응답 빠름 (~1초).
     """
-    lat, lon, _ = _geocode_city(city)
+    return get_weather_openmeteo_batch([city])[0]
+
+
+def get_weather_openmeteo_batch(cities: Sequence[str]) -> list[dict]:
+    """
+    여러 위치의 날씨를 Open-Meteo 요청 1회로 가져옵니다 (좌표를 쉼표로 묶어 전달).
+    지오코딩은 도시별로 하되 캐시를 사용합니다.
+
+    Returns:
+        list[dict]: cities 순서와 같은 순서의 예보 데이터
+    """
+    coords = [_geocode_city(city)[:2] for city in cities]
+    today = datetime.now(KST).strftime("%Y-%m-%d")
 
-    resp = requests.get(
+    resp = _SESSION.get(
         "https://api.open-meteo.com/v1/forecast",
         params={
-            "latitude": lat,
-            "longitude": lon,
+            "latitude": ",".join(str(lat) for lat, _ in coords),
+            "longitude": ",".join(str(lon) for _, lon in coords),
             "current": "temperature_2m,relative_humidity_2m,apparent_temperature,"
                        "weather_code,wind_speed_10m",
             "daily": "temperature_2m_max,temperature_2m_min,sunrise,sunset",
             "hourly": "precipitation_probability",
+            # 시간별 데이터는 표시 구간(09~21시)만 받음 (24시간 전체 불필요)
+            "start_hour": f"{today}T{_RAIN_HOURS[0]:02d}:00",
+            "end_hour": f"{today}T{_RAIN_HOURS[-1]:02d}:00",
             "timezone": "Asia/Seoul",
             "forecast_days": 1,
         },
-        timeout=10,
+        timeout=5,  # wttr.in과 동시 요청하므로 느리면 빨리 포기
     )
     resp.raise_for_status()
-    return resp.json()
+    data = json_codec.loads(resp.content)
+    # 위치가 1개면 객체, 여러 개면 배열로 응답
+    return data if isinstance(data, list) else [data]
 
 
 def format_weather_openmeteo(data: dict, city_kr: str) -> str:
@@ -142,61 +280,55 @@ def format_weather_openmeteo(data: dict, city_kr: str) -> str:
     humidity = cur["relative_humidity_2m"]
     wind = round(cur["wind_speed_10m"])
     code = cur.get("weather_code", 0)
-    desc = _WMO.get(code, "Unknown")
 
     max_temp = round(daily["temperature_2m_max"][0])
     min_temp = round(daily["temperature_2m_min"][0])
     sunrise = daily["sunrise"][0].split("T")[1]  # "07:05"
     sunset = daily["sunset"][0].split("T")[1]
 
-    # 시간대별 강수확률 (오전9시/오후15시/저녁21시)
-    rain_morning = hourly_precip[9] if len(hourly_precip) > 9 else 0
-    rain_afternoon = hourly_precip[15] if len(hourly_precip) > 15 else 0
-    rain_evening = hourly_precip[21] if len(hourly_precip) > 21 else 0
+    # 시간대별 강수확률 (오전9시/오후15시/저녁21시, 응답은 09시부터 시작)
+    rain_morning, rain_afternoon, rain_evening = (
+        hourly_precip[i] if len(hourly_precip) > i else 0
+        for i in (h - _RAIN_HOURS[0] for h in _RAIN_HOURS)
+    )
     max_rain = max(rain_morning, rain_afternoon, rain_evening)
 
-    emoji = weather_emoji(desc)
+    emoji = _wmo_emoji(code)
     warning = rain_warning(max_rain)
     date_str = datetime.now().strftime("%Y-%m-%d")
 
-    lines = [
-        f"{emoji} <b>{city_kr} 오늘의 날씨</b>  ({date_str})",
-        "",
-        f"🌡️ 현재 <b>{temp}°C</b> (체감 {feels}°C)",
-        f"📊 최고 <b>{max_temp}°C</b> / 최저 <b>{min_temp}°C</b>",
-        f"💧 습도 {humidity}%  |  💨 풍속 {wind}km/h",
-        "",
-        "🌧️ <b>강수확률</b>",
-        f"   오전 {rain_morning}%  |  오후 {rain_afternoon}%  |  저녁 {rain_evening}%",
-    ]
-
-    if warning:
-        lines.append("")
-        lines.append(warning)
-
-    lines.extend([
-        "",
-        f"🌅 일출 {sunrise}  |  🌇 일몰 {sunset}",
-    ])
-
-    return "\n".join(lines)
+    warning_block = f"\n\n{warning}" if warning else ""
+
+    return (
+        f"{emoji} <b>{city_kr} 오늘의 날씨</b>  ({date_str})\n"
+        "\n"
+        f"🌡️ 현재 <b>{temp}°C</b> (체감 {feels}°C)\n"
+        f"📊 최고 <b>{max_temp}°C</b> / 최저 <b>{min_temp}°C</b>\n"
+        f"💧 습도 {humidity}%  |  💨 풍속 {wind}km/h\n"
+        "\n"
+        "🌧️ <b>강수확률</b>\n"
+        f"   오전 {rain_morning}%  |  오후 {rain_afternoon}%  |  저녁 {rain_evening}%"
+        f"{warning_block}\n"
+        "\n"
+        f"🌅 일출 {sunrise}  |  🌇 일몰 {sunset}"
+    )
 
 
 # ──────────────────────────────────────────────
-# 날씨 API: wttr.in (fallback, 느리지만 데이터 풍부)
+# 날씨 API: wttr.in (보조, 느리지만 데이터 풍부)
 # ──────────────────────────────────────────────
 
-def get_weather_wttr(city: str, max_retries: int = 3) -> dict:
-    """wttr.in API (재시도 포함)"""
+def get_weather_wttr(city: str, max_retries: int = 3,
+                     stop: threading.Event | None = None) -> dict:
+    """wttr.in API (재시도 포함, stop이 설정되면 남은 재시도를 중단)"""
     url = f"https://wttr.in/{city}?format=j1"
-    headers = {"User-Agent": "curl/7.68.0", "Accept": "application/json"}
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=20)
+            response = _SESSION.get(url, headers=_WTTR_HEADERS, timeout=20)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return json_codec.loads(response.content)
+        except (requests.RequestException, json_codec.JSONDecodeError) as e:
             if attempt < max_retries - 1:
                 wait = (attempt + 1) * 5
                 print(
@@ -204,7 +336,10 @@ def get_weather_wttr(city: str, max_retries: int = 3) -> dict:
                     f"({wait}초 대기): {e}",
                     flush=True,
                 )
-                time.sleep(wait)
+                if stop is None:
+                    time.sleep(wait)
+                elif stop.wait(wait):
+                    raise
             else:
                 raise
 
@@ -235,86 +370,145 @@ def format_weather_wttr(data: dict, city_kr: str) -> str:
     warning = rain_warning(max_rain)
     date_str = today["date"]
 
-    lines = [
-        f"{emoji} <b>{city_kr} 오늘의 날씨</b>  ({date_str})",
-        "",
-        f"🌡️ 현재 <b>{temp}°C</b> (체감 {feels}°C)",
-        f"📊 최고 <b>{max_temp}°C</b> / 최저 <b>{min_temp}°C</b>",
-        f"💧 습도 {humidity}%  |  💨 풍속 {wind}km/h",
-        "",
-        "🌧️ <b>강수확률</b>",
-        f"   오전 {rain_morning}%  |  오후 {rain_afternoon}%  |  저녁 {rain_evening}%",
-    ]
-
-    if warning:
-        lines.append("")
-        lines.append(warning)
-
-    lines.extend([
-        "",
-        f"🌅 일출 {sunrise}  |  🌇 일몰 {sunset}",
-    ])
-
-    return "\n".join(lines)
+    warning_block = f"\n\n{warning}" if warning else ""
+
+    return (
+        f"{emoji} <b>{city_kr} 오늘의 날씨</b>  ({date_str})\n"
+        "\n"
+        f"🌡️ 현재 <b>{temp}°C</b> (체감 {feels}°C)\n"
+        f"📊 최고 <b>{max_temp}°C</b> / 최저 <b>{min_temp}°C</b>\n"
+        f"💧 습도 {humidity}%  |  💨 풍속 {wind}km/h\n"
+        "\n"
+        "🌧️ <b>강수확률</b>\n"
+        f"   오전 {rain_morning}%  |  오후 {rain_afternoon}%  |  저녁 {rain_evening}%"
+        f"{warning_block}\n"
+        "\n"
+        f"🌅 일출 {sunrise}  |  🌇 일몰 {sunset}"
+    )
 
 
 # ──────────────────────────────────────────────
-# 통합 날씨 조회 (Open-Meteo 우선 → wttr.in fallback)
+# 통합 날씨 조회 (Open-Meteo / wttr.in 동시 요청, 먼저 성공한 쪽 사용)
 # ──────────────────────────────────────────────
 
 def get_weather_message(city: str, city_kr: str) -> str:
     """
-    Open-Meteo를 먼저 시도하고, 실패 시 wttr.in으로 fallback.
-    최종 포맷된 메시지 문자열을 반환합니다.
+    날씨 메시지를 반환합니다.
+    같은 날 같은 위치의 메시지는 MESSAGE_CACHE_TTL_SEC 동안 재사용합니다
+    (재시도/즉시 실행/명령 응답 시 API 재조회 생략, 예보는 시간 단위로만 갱신됨).
+    """
+    key = (city, city_kr, datetime.now(KST).strftime("%Y-%m-%d"))
+    now = time.monotonic()
+    with _message_cache_lock:
+        cached = _message_cache.get(key)
+        if cached and now - cached[0] < MESSAGE_CACHE_TTL_SEC:
+            print("[날씨] 캐시된 메시지 사용", flush=True)
+            return cached[1]
+
+    msg = _fetch_weather_message(city, city_kr)
+
+    with _message_cache_lock:
+        # 만료된 항목 정리 후 저장
+        for k in [k for k, (at, _) in _message_cache.items()
+                  if now - at >= MESSAGE_CACHE_TTL_SEC]:
+            del _message_cache[k]
+        _message_cache[key] = (time.monotonic(), msg)
+    return msg
+
+
+def _fetch_weather_message(city: str, city_kr: str) -> str:
     """
-    # 1차: Open-Meteo (빠름, ~1초)
+    Open-Meteo와 wttr.in을 동시에 요청하여 먼저 성공한 쪽의 메시지를 반환합니다.
+    (한쪽이 느리거나 실패해도 다른 쪽 결과를 바로 사용, 둘 다 실패하면 마지막 예외 발생)
+    먼저 성공하면 wttr.in 쪽의 남은 재시도 대기를 중단시킵니다.
+    """
+    stop = threading.Event()
+    futures = {
+        _FETCH_POOL.submit(_openmeteo_message, city, city_kr): "Open-Meteo",
+        _FETCH_POOL.submit(_wttr_message, city, city_kr, stop): "wttr.in",
+    }
+    last_error = None
     try:
-        data = get_weather_openmeteo(city)
-        msg = format_weather_openmeteo(data, city_kr)
-        print("[날씨] Open-Meteo 성공", flush=True)
-        return msg
-    except Exception as e:
-        print(f"[날씨] Open-Meteo 실패 ({type(e).__name__}: {e}), wttr.in 시도...", flush=True)
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                msg = future.result()
+            except Exception as e:
+                print(f"[날씨] {source} 실패 ({type(e).__name__}: {e})", flush=True)
+                last_error = e
+                continue
+            print(f"[날씨] {source} 성공", flush=True)
+            return msg
+        raise last_error
+    finally:
+        stop.set()
+
+
+def _openmeteo_message(city: str, city_kr: str) -> str:
+    return format_weather_openmeteo(get_weather_openmeteo(city), city_kr)
+
+
+def _wttr_message(city: str, city_kr: str, stop: threading.Event | None = None) -> str:
+    return format_weather_wttr(get_weather_wttr(city, stop=stop), city_kr)
+
 
-    # 2차: wttr.in (느림, fallback)
-    data = get_weather_wttr(city)
-    print("[날씨] wttr.in 성공 (fallback)", flush=True)
-    return format_weather_wttr(data, city_kr)
+def warm_up():
+    """
+    발송 직전 예열: 위치 좌표를 캐시에 올리고 Open-Meteo 연결을 미리 맺어 둡니다.
+    실패해도 본 작업에는 영향 없음.
+    """
+    try:
+        city, _ = load_location()
+        _geocode_city(city)
+        _SESSION.head("https://api.open-meteo.com/v1/forecast", timeout=3)
+    except Exception as e:
+        print(f"[날씨] 예열 실패 (무시): {type(e).__name__}: {e}", flush=True)
 
 
 # ──────────────────────────────────────────────
 # 공통 유틸
 # ──────────────────────────────────────────────
 
+# 강수확률 구간별 우산 안내 (40% 미만 / 40% 이상 / 70% 이상)
+_RAIN_THRESHOLDS = (40, 70)
+_RAIN_WARNINGS = ("", "🌂 우산 챙기는 게 좋겠어요", "☂️ <b>우산 꼭 챙기세요!</b>")
+
+# 날씨 설명 키워드 → 이모지 (위에서부터 먼저 일치하는 규칙 적용)
+_EMOJI_RULES = (
+    (("clear", "sunny"), "☀️"),
+    (("partly",), "⛅"),
+    (("cloud", "overcast"), "☁️"),
+    (("rain", "drizzle", "shower"), "🌧️"),
+    (("snow",), "❄️"),
+    (("thunder", "storm"), "⛈️"),
+    (("fog", "mist", "rime"), "🌫️"),
+    (("wind",), "💨"),
+)
+
+
+def _wmo_emoji(code) -> str:
+    """WMO 날씨 코드 → 이모지 (3.0처럼 정수값인 실수 코드도 허용)"""
+    try:
+        index = int(code)
+    except (TypeError, ValueError, OverflowError):
+        return _DEFAULT_WEATHER_EMOJI
+    if index == code and 0 <= index < len(_WMO_EMOJI):
+        return _WMO_EMOJI[index]
+    return _DEFAULT_WEATHER_EMOJI
+
+
 def weather_emoji(desc: str) -> str:
     """날씨 설명에 맞는 이모지를 반환합니다."""
     desc_lower = desc.lower()
-    if "clear" in desc_lower or "sunny" in desc_lower:
-        return "☀️"
-    elif "partly" in desc_lower:
-        return "⛅"
-    elif "cloud" in desc_lower or "overcast" in desc_lower:
-        return "☁️"
-    elif "rain" in desc_lower or "drizzle" in desc_lower or "shower" in desc_lower:
-        return "🌧️"
-    elif "snow" in desc_lower:
-        return "❄️"
-    elif "thunder" in desc_lower or "storm" in desc_lower:
-        return "⛈️"
-    elif "fog" in desc_lower or "mist" in desc_lower or "rime" in desc_lower:
-        return "🌫️"
-    elif "wind" in desc_lower:
-        return "💨"
-    return "🌤️"
+    for needles, emoji in _EMOJI_RULES:
+        if any(n in desc_lower for n in needles):
+            return emoji
+    return _DEFAULT_WEATHER_EMOJI
 
 
 def rain_warning(chance: int) -> str:
     """강수확률에 따른 우산 안내 메시지"""
-    if chance >= 70:
-        return "☂️ <b>우산 꼭 챙기세요!</b>"
-    elif chance >= 40:
-        return "🌂 우산 챙기는 게 좋겠어요"
-    return ""
+    return _RAIN_WARNINGS[bisect_right(_RAIN_THRESHOLDS, chance)]
 
 
 # ──────────────────────────────────────────────
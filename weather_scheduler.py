@@ -22,54 +22,102 @@ Railway 배포 시 이 파일이 메인 프로세스로 실행됩니다.
     python weather_scheduler.py --test   # 즉시 1회만 실행 후 종료
 """
 
-import json
+import heapq
+import itertools
 import os
 import sys
 import time
 import signal
 import threading
-from datetime import datetime
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-import schedule
-
-# 한국 표준시 (KST, UTC+9)
+# 한국 표준시 (KST, UTC+9, 서머타임 없음)
 KST = ZoneInfo("Asia/Seoul")
 
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
+import json_codec
 from config import TELEGRAM_BOT_TOKEN, WEATHER_SCHEDULE_TIME, NEWS_SCHEDULE_TIMES
-from weather_alert import main as send_weather
+from weather_alert import main as send_weather, warm_up as warm_up_weather
 from news_bot import send_news
-from bot_commands import start_command_listener
+from news_scraper import warm_up as warm_up_news
+from bot_commands import start_command_listener, stop_command_workers
 
 STATE_FILE = Path(__file__).parent / "scheduler_state.json"
 
+# 상태 메모리 캐시 (재시도 스레드와 공유)
+_state_cache: dict | None = None
+_state_lock = threading.Lock()
+
 # 재시도 설정: (대기분, 대기분)
 RETRY_DELAYS_MIN = [5, 10]
 
+# KST의 UTC 기준 오프셋 (초)
+_KST_OFFSET_SEC = 9 * 3600
+
+# 오늘 날짜 문자열 캐시: (KST 기준 epoch 일수, "YYYY-MM-DD")
+_today_cache: tuple[int, str] = (-1, "")
+
+# 종료 신호 (재시도 대기/스케줄 루프 대기를 즉시 깨움)
+_SHUTDOWN = threading.Event()
+
+# 실패 작업 재시도 전용 스레드 풀 (장애가 길어져도 재시도 스레드가 무한히 늘지 않음)
+_RETRY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="retry")
+
+# 작업 몇 분 전에 연결/캐시 예열 (서버 keep-alive 유지 시간 안에 들도록 짧게)
+WARMUP_LEAD_MIN = 1
+
+# 매일 반복 작업 큐: (다음 실행 timestamp, 등록 순번, "HH:MM", 함수) — 가장 이른 작업이 맨 앞
+_job_queue: list[tuple[float, int, str, Callable[[], object]]] = []
+_job_seq = itertools.count()
+
+# 스케줄 루프 최대 대기 시간 (다음 작업까지 길어도 이 간격으로는 깨어남)
+MAX_IDLE_SLEEP_SEC = 300
+
 
 # ──────────────────────────────────────────────
 # 상태 추적 (당일 발송 이력)
 # ──────────────────────────────────────────────
 
+def _cached_state() -> dict:
+    """메모리 상태 (파일은 최초 1회만 읽음, _state_lock을 잡은 상태에서 호출)"""
+    global _state_cache
+    if _state_cache is None:
+        _state_cache = {}
+        if STATE_FILE.exists():
+            try:
+                _state_cache = json_codec.loads(STATE_FILE.read_bytes())
+            except (json_codec.JSONDecodeError, KeyError):
+                pass
+    return _state_cache
+
+
 def _load_state() -> dict:
-    """스케줄러 상태 파일 로드"""
-    if STATE_FILE.exists():
-        try:
-            return json.loads(STATE_FILE.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, KeyError):
-            pass
-    return {}
+    """스케줄러 상태 로드 (사본 반환 — 변경은 _update_state로)"""
+    with _state_lock:
+        return dict(_cached_state())
+
 
+def _update_state(**fields):
+    """상태 항목을 갱신하고 파일에 저장 (임시 파일에 쓴 뒤 교체 → 종료 중에도 파일 손상 없음)"""
+    with _state_lock:
+        state = _cached_state()
+        state.update(fields)
+        tmp = STATE_FILE.with_suffix(".tmp")
+        tmp.write_bytes(json_codec.dumps(state, indent=True))
+        os.replace(tmp, STATE_FILE)
 
-def _save_state(state: dict):
-    """스케줄러 상태 파일 저장"""
-    STATE_FILE.write_text(
-        json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+
+def _minutes_before(hhmm: str, minutes: int) -> str:
+    """"HH:MM"에서 minutes분 이전 시각 ("00:00" 이전이면 전날 시각)"""
+    h, m = map(int, hhmm.split(":"))
+    total = (h * 60 + m - minutes) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
 
 
 def _now() -> datetime:
@@ -77,20 +125,54 @@ def _now() -> datetime:
     return datetime.now(KST)
 
 
+# ──────────────────────────────────────────────
+# 매일 반복 작업 스케줄 (KST, 힙 기반)
+# ──────────────────────────────────────────────
+
+def _next_fire(hhmm: str, after: datetime) -> datetime:
+    """after 이후 처음 돌아오는 KST "HH:MM" 시각"""
+    h, m = map(int, hhmm.split(":"))
+    run = after.replace(hour=h, minute=m, second=0, microsecond=0)
+    if run <= after:
+        run += timedelta(days=1)  # KST는 서머타임이 없어 하루 = 24시간
+    return run
+
+
+def _schedule_daily(hhmm: str, func: Callable[[], object]):
+    """매일 KST hhmm에 func 실행 등록"""
+    ts = _next_fire(hhmm, _now()).timestamp()
+    heapq.heappush(_job_queue, (ts, next(_job_seq), hhmm, func))
+
+
+def _run_due_jobs():
+    """실행 시각이 된 작업을 실행하고 다음 날로 다시 등록"""
+    while _job_queue and _job_queue[0][0] <= time.time():
+        _, seq, hhmm, func = heapq.heappop(_job_queue)
+        try:
+            func()
+        except Exception as e:
+            print(f"[ERROR] 스케줄 작업 {func.__name__} 오류: {e}", flush=True)
+        ts = _next_fire(hhmm, _now()).timestamp()
+        heapq.heappush(_job_queue, (ts, seq, hhmm, func))
+
+
+def _today_str() -> str:
+    """KST 기준 오늘 날짜 "YYYY-MM-DD" (날짜가 바뀔 때만 다시 포맷)"""
+    global _today_cache
+    day = int((time.time() + _KST_OFFSET_SEC) // 86400)
+    if _today_cache[0] != day:
+        _today_cache = (day, time.strftime("%Y-%m-%d", time.gmtime(day * 86400)))
+    return _today_cache[1]
+
+
 def _mark_done(job_key: str):
     """작업 완료를 기록 (날짜+시간 키)"""
-    state = _load_state()
-    today = _now().strftime("%Y-%m-%d")
-    state[job_key] = today
-    state["_last_heartbeat"] = _now().isoformat()
-    _save_state(state)
+    _update_state(**{job_key: _today_str()}, _last_heartbeat=_now().isoformat())
 
 
 def _was_done_today(job_key: str) -> bool:
     """오늘 이미 완료된 작업인지 확인"""
-    state = _load_state()
-    today = _now().strftime("%Y-%m-%d")
-    return state.get(job_key) == today
+    return _load_state().get(job_key) == _today_str()
 
 
 # ──────────────────────────────────────────────
@@ -126,7 +208,8 @@ def weather_job():
             if _was_done_today(job_key):
                 return
             print(f"[날씨] 재시도 {i}/{len(RETRY_DELAYS_MIN)} ({delay_min}분 후)", flush=True)
-            time.sleep(delay_min * 60)
+            if _SHUTDOWN.wait(delay_min * 60):
+                return  # 종료 중이면 재시도 중단
             if _was_done_today(job_key):
                 return
             try:
@@ -139,7 +222,7 @@ def weather_job():
                 print(f"[ERROR] 날씨 재시도 {i} 오류: {e}", flush=True)
         print("[날씨] 모든 재시도 실패", flush=True)
 
-    threading.Thread(target=_retry, daemon=True, name="WeatherRetry").start()
+    _RETRY_POOL.submit(_retry)
 
 
 def news_job(period_override: str | None = None):
@@ -183,7 +266,8 @@ def news_job(period_override: str | None = None):
             if _was_done_today(job_key):
                 return
             print(f"[뉴스] 재시도 {i}/{len(RETRY_DELAYS_MIN)} ({delay_min}분 후)", flush=True)
-            time.sleep(delay_min * 60)
+            if _SHUTDOWN.wait(delay_min * 60):
+                return  # 종료 중이면 재시도 중단
             if _was_done_today(job_key):
                 return
             try:
@@ -196,12 +280,16 @@ def news_job(period_override: str | None = None):
                 print(f"[ERROR] 뉴스 재시도 {i} 오류: {e}", flush=True)
         print("[뉴스] 모든 재시도 실패", flush=True)
 
-    threading.Thread(target=_retry, daemon=True, name="NewsRetry").start()
+    _RETRY_POOL.submit(_retry)
 
 
 def graceful_shutdown(signum, frame):
     """종료 시그널 처리 (Railway 재시작/종료 대응)"""
     print(f"\n[{_now().strftime('%H:%M:%S')}] 스케줄러 종료 중...", flush=True)
+    _SHUTDOWN.set()
+    # 대기 중인 재시도/명령은 취소 (실행 중인 요청은 각자의 timeout 안에 끝남)
+    _RETRY_POOL.shutdown(wait=False, cancel_futures=True)
+    stop_command_workers()
     sys.exit(0)
 
 
@@ -240,18 +328,23 @@ def main():
         print("[테스트 모드] 날씨 + 뉴스 즉시 1회 실행", flush=True)
         weather_job()
         news_job()
+        # 1회 실행 모드에서는 재시도를 기다리지 않고 바로 종료 (대기 중인 재시도 취소)
+        _SHUTDOWN.set()
+        _RETRY_POOL.shutdown(wait=False, cancel_futures=True)
         return
 
     # === 스케줄 등록 ===
 
-    # 날씨 스케줄 (KST 명시 — schedule 라이브러리는 문자열/pytz만 허용)
+    # 날씨 스케줄 (KST)
     weather_time = WEATHER_SCHEDULE_TIME
-    schedule.every().day.at(weather_time, tz="Asia/Seoul").do(weather_job)
+    _schedule_daily(weather_time, weather_job)
+    _schedule_daily(_minutes_before(weather_time, WARMUP_LEAD_MIN), warm_up_weather)
     print(f"  [스케줄] 날씨 알림: 매일 {weather_time} KST", flush=True)
 
-    # 뉴스 스케줄 (여러 시간 지원, KST 명시)
+    # 뉴스 스케줄 (여러 시간 지원, KST)
     for news_time in NEWS_SCHEDULE_TIMES:
-        schedule.every().day.at(news_time, tz="Asia/Seoul").do(news_job)
+        _schedule_daily(news_time, news_job)
+        _schedule_daily(_minutes_before(news_time, WARMUP_LEAD_MIN), warm_up_news)
         print(f"  [스케줄] 뉴스 브리핑: 매일 {news_time} KST", flush=True)
 
     # === 텔레그램 커맨드 리스너 시작 (별도 스레드) ===
@@ -272,28 +365,32 @@ def main():
         _recover_missed_jobs()
 
     # 다음 실행 시간 표시
-    jobs = schedule.get_jobs()
-    if jobs:
-        print(f"\n[등록된 작업: {len(jobs)}개]", flush=True)
-        for j in sorted(jobs, key=lambda x: x.next_run):
-            print(f"  다음 실행: {j.next_run.strftime('%Y-%m-%d %H:%M:%S')} - {j.job_func.__name__}", flush=True)
+    if _job_queue:
+        print(f"\n[등록된 작업: {len(_job_queue)}개]", flush=True)
+        for ts, _, _, func in sorted(_job_queue):
+            next_run = datetime.fromtimestamp(ts, KST)
+            print(f"  다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')} - {func.__name__}", flush=True)
 
     # 스케줄 루프 (하트비트 포함)
     heartbeat_interval = 3600  # 1시간마다 하트비트
     last_heartbeat = time.time()
 
     while True:
-        schedule.run_pending()
+        _run_due_jobs()
 
         # 하트비트 로그 (1시간마다)
         if time.time() - last_heartbeat >= heartbeat_interval:
-            state = _load_state()
-            state["_last_heartbeat"] = _now().isoformat()
-            _save_state(state)
+            _update_state(_last_heartbeat=_now().isoformat())
             print(f"[하트비트] {_now().strftime('%H:%M')} 스케줄러 정상 동작 중", flush=True)
             last_heartbeat = time.time()
 
-        time.sleep(5)  # 5초 간격으로 체크 (정확한 스케줄 실행)
+        # 다음 작업 또는 하트비트 시각까지 대기 (최대 MAX_IDLE_SLEEP_SEC)
+        heartbeat_in = heartbeat_interval - (time.time() - last_heartbeat)
+        sleep_for = min(heartbeat_in, MAX_IDLE_SLEEP_SEC)
+        if _job_queue:
+            sleep_for = min(sleep_for, _job_queue[0][0] - time.time())
+        if _SHUTDOWN.wait(max(0.0, sleep_for)):
+            break
 
 
 if __name__ == "__main__":